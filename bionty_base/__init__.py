@@ -42,6 +42,7 @@ PublicOntology sources:
    display_available_sources
    display_currently_used_sources
    reset_sources
+   SourceRegistry
    settings
 
 External API:
@@ -54,40 +55,93 @@ External API:
 
 __version__ = "0.38.0"  # denote release candidate for 0.1.0 with 0.1rc1
 
-from ._sync_sources import sync_sources
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-sync_sources()
-
-# dynamic classes
-from . import dev
-from ._display_sources import display_available_sources, display_currently_used_sources
-from ._ontology import Ontology
-
-# tools
-from ._public_ontology import PublicOntology, PublicOntologyField
 from ._settings import settings
 
-# sources
-from .dev._handle_sources import reset_sources
-from .entities._bfxpipeline import BFXPipeline
-from .entities._biosample import BioSample
-from .entities._cellline import CellLine
-from .entities._cellmarker import CellMarker
-from .entities._celltype import CellType
-from .entities._developmentalstage import DevelopmentalStage
-from .entities._disease import Disease
-from .entities._drug import Drug
-from .entities._ethnicity import Ethnicity
-from .entities._experimentalfactor import ExperimentalFactor
-from .entities._gene import Gene
-from .entities._organism import Organism
-from .entities._pathway import Pathway
-from .entities._phenotype import Phenotype
-from .entities._protein import Protein
-from .entities._tissue import Tissue
+# public attributes are imported on first access to keep `import bionty_base` cheap
+_LAZY_ATTRS = {
+    "sync_sources": "._sync_sources",
+    "display_available_sources": "._display_sources",
+    "display_currently_used_sources": "._display_sources",
+    "SourceRegistry": "._source_registry",
+    "Ontology": "._ontology",
+    "PublicOntology": "._public_ontology",
+    "PublicOntologyField": "._public_ontology",
+    "reset_sources": ".dev._handle_sources",
+    "BFXPipeline": ".entities._bfxpipeline",
+    "BioSample": ".entities._biosample",
+    "CellLine": ".entities._cellline",
+    "CellMarker": ".entities._cellmarker",
+    "CellType": ".entities._celltype",
+    "DevelopmentalStage": ".entities._developmentalstage",
+    "Disease": ".entities._disease",
+    "Drug": ".entities._drug",
+    "Ethnicity": ".entities._ethnicity",
+    "ExperimentalFactor": ".entities._experimentalfactor",
+    "Gene": ".entities._gene",
+    "Organism": ".entities._organism",
+    "Pathway": ".entities._pathway",
+    "Phenotype": ".entities._phenotype",
+    "Protein": ".entities._protein",
+    "Tissue": ".entities._tissue",
+}
 
 # backward compat
-Entity = PublicOntology
-Bionty = PublicOntology
-Readout = ExperimentalFactor
-Species = Organism
+_ALIASES = {
+    "Entity": "PublicOntology",
+    "Bionty": "PublicOntology",
+    "Readout": "ExperimentalFactor",
+    "Species": "Organism",
+}
+
+
+def __getattr__(name: str):
+    if name == "dev":
+        return import_module(".dev", __name__)
+    attr_name = _ALIASES.get(name, name)
+    if attr_name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRS[attr_name], __name__), attr_name)
+    # cache on the module so that __getattr__ is only hit once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_ALIASES) | {"dev"})
+
+
+if TYPE_CHECKING:
+    from . import dev
+    from ._display_sources import (
+        display_available_sources,
+        display_currently_used_sources,
+    )
+    from ._ontology import Ontology
+    from ._public_ontology import PublicOntology, PublicOntologyField
+    from ._source_registry import SourceRegistry
+    from ._sync_sources import sync_sources
+    from .dev._handle_sources import reset_sources
+    from .entities._bfxpipeline import BFXPipeline
+    from .entities._biosample import BioSample
+    from .entities._cellline import CellLine
+    from .entities._cellmarker import CellMarker
+    from .entities._celltype import CellType
+    from .entities._developmentalstage import DevelopmentalStage
+    from .entities._disease import Disease
+    from .entities._drug import Drug
+    from .entities._ethnicity import Ethnicity
+    from .entities._experimentalfactor import ExperimentalFactor
+    from .entities._gene import Gene
+    from .entities._organism import Organism
+    from .entities._pathway import Pathway
+    from .entities._phenotype import Phenotype
+    from .entities._protein import Protein
+    from .entities._tissue import Tissue
+
+    Entity = PublicOntology
+    Bionty = PublicOntology
+    Readout = ExperimentalFactor
+    Species = Organism
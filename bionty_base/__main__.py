@@ -0,0 +1,53 @@
+import argparse
+import sys
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bionty_base")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prefetch_parser = subparsers.add_parser(
+        "prefetch",
+        help="download and build the cached tables of sources",
+        description=(
+            "Download and build the cached tables of sources concurrently, by"
+            " default of all currently used sources."
+        ),
+    )
+    for key in ("entity", "organism", "source", "version"):
+        prefetch_parser.add_argument(
+            f"--{key}", nargs="+", help=f"only prefetch sources of these {key}s"
+        )
+    prefetch_parser.add_argument(
+        "--all-sources",
+        action="store_true",
+        help="prefetch all available sources instead of the currently used ones",
+    )
+    prefetch_parser.add_argument(
+        "--max-workers", type=int, default=4, help="number of concurrent workers"
+    )
+    prefetch_parser.add_argument(
+        "--processes", action="store_true", help="use processes instead of threads"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "prefetch":
+        from bionty_base.dev._prefetch import prefetch
+
+        report = prefetch(
+            entity=args.entity,
+            organism=args.organism,
+            source=args.source,
+            version=args.version,
+            currently_used=not args.all_sources,
+            max_workers=args.max_workers,
+            processes=args.processes,
+        )
+        print(report.to_string(index=False))
+        return int(report["error"].notna().any())
+    return 0  # pragma: no cover
+
+
+if __name__ == "__main__":
+    sys.exit(main())
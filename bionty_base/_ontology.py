@@ -5,6 +5,8 @@ from typing import BinaryIO, Dict, List, Optional, Union
 import pandas as pd
 import pronto
 
+from .dev._io import compression_suffix, open_decompressed
+
 
 class Ontology(pronto.Ontology):
     """Interface with ontologies via pronto.
@@ -12,7 +14,8 @@ class Ontology(pronto.Ontology):
     Also see: https://pronto.readthedocs.io/en/stable/api/pronto.Ontology.html
 
     Args:
-        handle: Path to an ontology source file.
+        handle: Path to an ontology source file, decompressed while it's parsed if
+            it ends with `.gz`, `.bz2`, `.xz` or `.zst`.
         import_depth: The maximum depth of imports to resolve in the ontology tree.
         timeout: The timeout in seconds to use when performing network I/O.
         threads: The number of threads to use when parsing.
@@ -30,6 +33,19 @@ class Ontology(pronto.Ontology):
     ) -> None:
         self._prefix = prefix
         warnings.filterwarnings("ignore", category=pronto.warnings.ProntoWarning)
+        if (
+            isinstance(handle, (str, Path))
+            and compression_suffix(handle)
+            and Path(handle).is_file()
+        ):
+            with open_decompressed(handle) as f:
+                super().__init__(
+                    handle=f,
+                    import_depth=import_depth,
+                    timeout=timeout,
+                    threads=threads,
+                )
+            return
         super().__init__(
             handle=handle, import_depth=import_depth, timeout=timeout, threads=threads
         )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from ._settings import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class OntologyCache:
+    """Process-wide LRU cache of loaded ontology tables.
+
+    Tables are shared between all PublicOntology objects of the same entity,
+    organism, source, version and include_id_prefixes, and must not be modified in
+    place. The cache is disabled unless `settings.ontology_cache_max_bytes` is set.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.ontology_cache_max_bytes)
+
+    def get(self, key: tuple) -> pd.DataFrame | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, df: pd.DataFrame) -> None:
+        if not self.enabled:
+            return
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            # tables larger than the budget are not cached at all
+            if nbytes > settings.ontology_cache_max_bytes:
+                return
+            self._entries[key] = (df, nbytes)
+            self._nbytes += nbytes
+            self._evict(settings.ontology_cache_max_bytes)
+
+    def _evict(self, max_bytes: int) -> None:
+        while self._nbytes > max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self._nbytes,
+                "max_bytes": settings.ontology_cache_max_bytes,
+            }
+
+
+ontology_cache = OntologyCache()
+
+
+def ontology_cache_stats() -> dict[str, int]:
+    """Statistics of the process-wide ontology table cache.
+
+    Returns:
+        A dictionary of cache hits, misses, evictions, number of cached tables,
+        bytes held and the memory budget.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.settings.ontology_cache_max_bytes = 2 * 1024**3
+        >>> bt.Gene()
+        >>> bt.Gene()
+        >>> bt.dev.ontology_cache_stats()
+    """
+    return ontology_cache.stats()
+
+
+def clear_ontology_cache() -> None:
+    """Remove all tables from the process-wide ontology table cache."""
+    ontology_cache.clear()
@@ -13,10 +13,25 @@ from lamin_utils import logger
 from lamin_utils._lookup import Lookup
 
 from ._ontology import Ontology
+from ._ontology_cache import ontology_cache
 from ._settings import check_datasetdir_exists, check_dynamicdir_exists, settings
+from ._storage import (
+    parquet_column_names,
+    read_memory_mapped_columns,
+    read_parquet_columns,
+    write_parquet,
+)
+from .dev._cache import _enforce_budget, record_access
+from .dev._cas import materialize, store
 from .dev._handle_sources import LAMINDB_INSTANCE_LOADED
-from .dev._io import s3_bionty_assets, url_download
-from .dev._md5 import verify_md5
+from .dev._io import (
+    _trust_cached_file,
+    compression_suffix,
+    file_lock,
+    s3_bionty_assets,
+    url_download,
+)
+from .dev._md5 import calculate_md5, record_md5
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -50,6 +65,8 @@ class PublicOntology:
         organism: str | None = None,
         *,
         include_id_prefixes: dict[str, list[str]] | None = None,
+        columns: Iterable[str] | None = None,
+        lazy: bool = False,
         **kwargs,
     ):
         # backward compat for species -> organism
@@ -59,10 +76,10 @@ class PublicOntology:
         try:
             # match user input organism, source and version with currently used sources
             current = self._match_sources(
-                self._current_sources,
                 source=source,
                 version=version,
                 organism=organism,
+                currently_used=True,
             )
             source = current.get("source")
             version = current.get("version")
@@ -81,7 +98,6 @@ class PublicOntology:
 
         # search in all available sources to get url and md5
         self._source_record = self._match_sources(
-            self._all_sources,
             source=source,
             version=version,
             organism=organism,
@@ -93,21 +109,31 @@ class PublicOntology:
 
         self._set_file_paths()
         self.include_id_prefixes = include_id_prefixes
-
-        # df is only read into memory at the init to improve performance
-        df = self._load_df()
-        # self._df has no index
-        if df.index.name is not None:
-            df = df.reset_index()
-        self._df: pd.DataFrame = df
-
-        # set column names/fields as attributes
-        for col_name in self._df.columns:
-            try:
-                setattr(self, col_name, PublicOntologyField(self, col_name))
-            # Some fields of an ontology (e.g. Gene) are not PublicOntology class attributes and must be skipped.
-            except AttributeError:
-                pass
+        # columns to load, other columns are loaded on first access
+        self._columns = None if columns is None else list(columns)
+        self._loaded_df: pd.DataFrame | None = None
+        self._known_column_names: list[str] | None = None
+
+        if not lazy:
+            # df is only read into memory at the init to improve performance
+            self._load()
+        elif self._local_parquet_path.exists():
+            # fields are known from the schema of a cached table without loading it
+            self._set_column_names(parquet_column_names(self._local_parquet_path))
+
+    def __getattr__(self, name: str):
+        # only called for missing attributes: fields of a lazy PublicOntology whose
+        # column names are not known before its table is loaded
+        if (
+            not name.startswith("_")
+            and "_source_record" in self.__dict__
+            and self.__dict__.get("_known_column_names") is None
+        ):
+            self._load()
+            return getattr(self, name)
+        raise AttributeError(
+            f"{self.__class__.__name__!r} object has no attribute {name!r}"
+        )
 
     def __repr__(self) -> str:
         # fmt: off
@@ -116,7 +142,7 @@ class PublicOntology:
             f"Entity: {self.__class__.__name__}\n"
             f"Organism: {self.organism}\n"
             f"Source: {self.source}, {self.version}\n"
-            f"#terms: {self._df.shape[0] if hasattr(self, '_df') else ''}\n\n"
+            f"#terms: {self._loaded_df.shape[0] if self._loaded_df is not None else ''}\n\n"
         )
         # fmt: on
         return representation
@@ -139,6 +165,8 @@ class PublicOntology:
     @property
     def fields(self) -> set:
         """All PublicOntology entity fields."""
+        # fields are set once the column names are known
+        self._column_names  # noqa: B018
         blacklist = {"include_id_prefixes"}
         fields = {
             field
@@ -147,109 +175,155 @@ class PublicOntology:
         }
         return fields - blacklist
 
+    @property
+    def _df(self) -> pd.DataFrame:
+        """The loaded table without index, loaded on first access if `lazy`."""
+        if self._loaded_df is None:
+            self._load()
+        return self._loaded_df  # type: ignore
+
+    @_df.setter
+    def _df(self, df: pd.DataFrame) -> None:
+        self._loaded_df = df
+
+    @property
+    def _column_names(self) -> list[str]:
+        """All columns of the table, including the ones that are not loaded yet."""
+        if self._known_column_names is None:
+            self._load()
+        return self._known_column_names  # type: ignore
+
+    def _load(self) -> None:
+        """Load the table into memory and set its fields."""
+        cache_key = self._cache_key()
+        df = ontology_cache.get(cache_key)
+        if df is None:
+            df = self._load_df(columns=self._columns)
+            # self._df has no index
+            if df.index.name is not None:
+                df = df.reset_index()
+            ontology_cache.put(cache_key, df)
+        self._loaded_df = df
+
+        if self._known_column_names is None:
+            if self._columns is not None and self._local_parquet_path.exists():
+                self._set_column_names(parquet_column_names(self._local_parquet_path))
+            else:
+                self._set_column_names(list(df.columns))
+
+    def _set_column_names(self, column_names: list[str]) -> None:
+        if self._columns is not None:
+            unknown_columns = set(self._columns).difference(column_names)
+            if len(unknown_columns) > 0:
+                raise ValueError(f"No {sorted(unknown_columns)} columns exist!")
+        self._known_column_names = column_names
+
+        # set column names/fields as attributes
+        for col_name in column_names:
+            try:
+                setattr(self, col_name, PublicOntologyField(self, col_name))
+            # Some fields of an ontology (e.g. Gene) are not PublicOntology class attributes and must be skipped.
+            except AttributeError:
+                pass
+
+    def _cache_key(self) -> tuple:
+        """Key of the loaded table in the process-wide ontology cache."""
+        include_id_prefixes = (
+            None
+            if self.include_id_prefixes is None
+            else tuple(
+                (k, tuple(v)) for k, v in sorted(self.include_id_prefixes.items())
+            )
+        )
+        return (
+            self.__class__,
+            self.organism,
+            self.source,
+            self.version,
+            include_id_prefixes,
+            None if self._columns is None else tuple(self._columns),
+            settings.memory_map,
+            settings.compact_dtypes,
+        )
+
     def _download_ontology_file(self, localpath: Path, url: str, md5: str = "") -> None:
         """Download ontology source file to _local_ontology_path."""
-        if not localpath.exists():
+        if localpath.exists():
+            return
+        # other processes wait for the file instead of downloading it again
+        with file_lock(localpath):
+            if localpath.exists():
+                return
+            # files already downloaded to the shared store are only linked
+            if materialize(localpath, md5=md5):
+                return
             logger.info(
                 f"downloading {self.__class__.__name__} ontology source file..."
             )
+            # md5 is only verified if it's available from the sources.yaml file,
+            # while the file is downloaded and before it's moved into place
             try:
-                self._url_download(url, localpath)
-            finally:
-                # Only verify md5 if it's actually available from the sources.yaml file
-                if len(md5) > 0:
-                    if not verify_md5(localpath, md5):
-                        logger.warning(
-                            f"MD5 sum for {localpath} did not match {md5}. re-downloading..."
-                        )
-                        localpath.unlink()
-                        self._url_download(url, localpath)
+                digest = self._url_download(url, localpath, md5=md5)
+            except ValueError as e:
+                logger.warning(f"{e} re-downloading...")
+                digest = self._url_download(url, localpath, md5=md5)
+            store(localpath, md5=md5 or digest or "")
+        _enforce_budget(keep=localpath)
 
     def _fetch_sources(self) -> None:
-        from ._display_sources import (
-            display_available_sources,
-            display_currently_used_sources,
-        )
-
-        def _subset_to_entity(df: pd.DataFrame, key: str):
-            return df.loc[[key]] if isinstance(df.loc[key], pd.Series) else df.loc[key]
+        from ._source_registry import SourceRegistry
 
-        self._current_sources = _subset_to_entity(
-            display_currently_used_sources(), self.__class__.__name__
-        )
-
-        self._all_sources = _subset_to_entity(
-            display_available_sources(), self.__class__.__name__
-        )
+        self._source_registry = SourceRegistry.get()
 
     def _match_sources(
         self,
-        ref_sources: pd.DataFrame,
         source: str | None = None,
         version: str | None = None,
         organism: str | None = None,
+        *,
+        currently_used: bool = False,
     ) -> dict[str, str]:
         """Match a source record base on passed organism, source and version."""
-        lc = locals()
+        return self._source_registry.match(
+            self.__class__.__name__,
+            organism=organism,
+            source=source,
+            version=version,
+            currently_used=currently_used,
+        )
 
-        # kwargs that are not None
-        kwargs = {
-            k: lc.get(k)
-            for k in ["source", "version", "organism"]
-            if lc.get(k) is not None
-        }
-        keys = list(kwargs.keys())
+    @check_dynamicdir_exists
+    def _url_download(self, url: str, localpath: Path, md5: str = "") -> str | None:
+        """Download file from url to dynamicdir _local_ontology_path.
 
-        # if 1 or 2 kwargs are specified, find the best match in currently used sources
-        if (len(kwargs) == 1) or (len(kwargs) == 2):
-            cond = ref_sources[keys[0]] == kwargs.get(keys[0])
-            if len(kwargs) == 1:
-                row = ref_sources[cond].head(1)
-            else:
-                # len(kwargs) == 2
-                cond = cond.__and__(ref_sources[keys[1]] == kwargs.get(keys[1]))
-                row = ref_sources[cond].head(1)
-        else:
-            # if no kwargs are passed, take the currently used source record
-            if len(keys) == 0:
-                curr = ref_sources.head(1).to_dict(orient="records")[0]
-                kwargs = {
-                    k: v
-                    for k, v in curr.items()
-                    if k in ["organism", "source", "version"]
-                }
-            # if all 3 kwargs are specified, match the record from currently used sources
-            # do the same for the kwargs that obtained from default source to obtain url
-            row = ref_sources[
-                (ref_sources["organism"] == kwargs["organism"])
-                & (ref_sources["source"] == kwargs["source"])
-                & (ref_sources["version"] == kwargs["version"])
-            ].head(1)
-
-        # if no records matched the passed kwargs, raise error
-        if row.shape[0] == 0:
-            raise ValueError(
-                f"No source is available with {kwargs}\nCheck"
-                " `.display_available_sources()`"
-            )
-        return row.to_dict(orient="records")[0]
+        Files are only moved into place once complete and matching `md5`.
 
-    @check_dynamicdir_exists
-    def _url_download(self, url: str, localpath: Path) -> None:
-        """Download file from url to dynamicdir _local_ontology_path."""
+        Returns:
+            The md5 sum of the downloaded file, None if it was up to date.
+        """
         # Try to download from s3://bionty-assets
-        s3_bionty_assets(
-            filename=self._ontology_filename,  # type: ignore
-            assets_base_url="s3://bionty-assets",
-            localpath=localpath,
-        )
+        # compressed source files are mirrored compressed, with the suffix of the url
+        try:
+            _, digest = s3_bionty_assets(
+                filename=f"{self._ontology_filename}{compression_suffix(url)}",
+                assets_base_url="s3://bionty-assets",
+                localpath=localpath,
+                md5=md5,
+                return_md5=True,
+            )
+            mirrored = localpath.exists()
+        except ValueError as e:
+            # the mirrored file is outdated or corrupt, the url is the reference
+            logger.warning(f"{e} downloading from the url instead...")
+            mirrored = False
 
         # If the file is not available, download from the url
-        if not localpath.exists():
+        if not mirrored:
             logger.info(
                 f"downloading {self.__class__.__name__} source file from: {url}"
             )
-            _ = url_download(url, localpath)
+            _, digest = url_download(url, localpath, md5=md5, return_md5=True)
+        return digest
 
     @check_datasetdir_exists
     def _set_file_paths(self) -> None:
@@ -272,41 +346,99 @@ class PublicOntology:
             if not self._url.startswith("s3://bionty-assets/"):
                 self._parquet_filename = None  # type:ignore
         else:
-            self._local_ontology_path = settings.dynamicdir / self._ontology_filename
+            # compressed source files are stored compressed and decompressed on parsing
+            self._local_ontology_path = (
+                settings.dynamicdir
+                / f"{self._ontology_filename}{compression_suffix(self._url)}"
+            )
 
     def _get_default_field(self, field: PublicOntologyField | str | None = None) -> str:
         """Default to name field."""
         if field is None:
-            if "name" in self._df.columns:
+            if "name" in self._column_names:
                 field = "name"
-            elif "symbol" in self._df.columns:
+            elif "symbol" in self._column_names:
                 field = "symbol"
             else:
                 raise ValueError("Please specify a field!")
         field = str(field)
-        if field not in self._df.columns:
+        if field not in self._column_names:
             raise AssertionError(f"No {field} column exists!")
         return field
 
-    def _load_df(self) -> pd.DataFrame:
-        if self._parquet_filename is None:
-            self._url_download(self._url, self._local_parquet_path)
-        else:
-            s3_bionty_assets(
-                filename=self._parquet_filename,
-                assets_base_url="s3://bionty-assets",
-                localpath=self._local_parquet_path,
+    def _ensure_columns(
+        self, columns: Iterable[PublicOntologyField | str | None] | None = None
+    ) -> pd.DataFrame:
+        """Load columns that are not loaded yet, all columns by default."""
+        # the table is loaded first, which sets the column names of lazy objects
+        self._df  # noqa: B018
+        if columns is None:
+            columns = self._column_names
+        missing = [
+            column
+            for column in dict.fromkeys(str(c) for c in columns if c is not None)
+            if column in self._column_names and column not in self._df.columns
+        ]
+        if len(missing) > 0:
+            df = pd.concat([self._df, self._read_columns(missing)[missing]], axis=1)
+            # a new DataFrame, cached tables are not modified
+            self._df = df[[c for c in self._column_names if c in df.columns]]
+        return self._df
+
+    def _read_columns(self, columns: list[str]) -> pd.DataFrame:
+        """Read columns of the table that were not loaded at the init."""
+        if self._local_parquet_path.exists():
+            return self._read_local_parquet(columns=columns)
+        return self._load_df(columns=columns).reset_index()
+
+    def _read_local_parquet(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Read the cached parquet file as configured in `settings`."""
+        record_access(self._local_parquet_path)
+        if settings.memory_map:
+            return read_memory_mapped_columns(
+                self._local_parquet_path,
+                columns=columns,
+                compact_dtypes=settings.compact_dtypes,
             )
-        # If download is not possible, write a parquet file of the ontology df
-        if not self._url.endswith("parquet"):
-            if not self._local_parquet_path.exists():
-                df = self.to_pronto().to_df(
-                    source=self.source, include_id_prefixes=self.include_id_prefixes
-                )
-                df.to_parquet(self._local_parquet_path)
+        return read_parquet_columns(
+            self._local_parquet_path,
+            columns=columns,
+            compact_dtypes=settings.compact_dtypes,
+        )
+
+    def _load_df(self, columns: list[str] | None = None) -> pd.DataFrame:
+        # cached files that are used without checking S3 need no lock
+        if not _trust_cached_file(self._local_parquet_path):
+            # one process downloads or builds the parquet file, the others wait
+            with file_lock(self._local_parquet_path):
+                if not self._local_parquet_path.exists():
+                    materialize(self._local_parquet_path)
+                if self._parquet_filename is None:
+                    self._url_download(self._url, self._local_parquet_path)
+                else:
+                    s3_bionty_assets(
+                        filename=self._parquet_filename,
+                        assets_base_url="s3://bionty-assets",
+                        localpath=self._local_parquet_path,
+                    )
+                # If download is not possible, write a parquet file of the ontology df
+                if not self._url.endswith("parquet"):
+                    if not self._local_parquet_path.exists():
+                        df = self.to_pronto().to_df(
+                            source=self.source,
+                            include_id_prefixes=self.include_id_prefixes,
+                        )
+                        write_parquet(df, self._local_parquet_path)
+                        # built files are trusted like verified downloads
+                        record_md5(
+                            self._local_parquet_path,
+                            calculate_md5(self._local_parquet_path),
+                        )
+                store(self._local_parquet_path)
 
         # Loading the parquet file resets the index
-        df = pd.read_parquet(self._local_parquet_path)
+        df = self._read_local_parquet(columns=columns)
+        _enforce_budget(keep=self._local_parquet_path)
         return df
 
     def to_pronto(self):
@@ -323,6 +455,7 @@ class PublicOntology:
                 url=self._url,
                 md5=self._md5,
             )
+            record_access(self._local_ontology_path)
             return Ontology(handle=self._local_ontology_path)
 
     def df(self) -> pd.DataFrame:
@@ -335,10 +468,12 @@ class PublicOntology:
             >>> import bionty_base as bt
             >>> bt.Gene().df()
         """
-        if "ontology_id" in self._df.columns:
-            return self._df.set_index("ontology_id")
+        df = self._ensure_columns()
+        if "ontology_id" in df.columns:
+            return df.set_index("ontology_id")
         else:
-            return self._df
+            # the table may be shared by other objects via the ontology cache
+            return df.copy(deep=False)
 
     def validate(
         self,
@@ -372,7 +507,7 @@ class PublicOntology:
         if isinstance(values, str):
             values = [values]
 
-        field_values = self._df[str(field)]
+        field_values = self._ensure_columns([field])[str(field)]
         return validate(
             identifiers=values,
             field_values=field_values,
@@ -417,7 +552,7 @@ class PublicOntology:
             values = [values]
 
         return inspect(
-            df=self._df,
+            df=self._ensure_columns([field, "synonyms"]),
             identifiers=values,
             field=str(field),
             mute=mute,
@@ -472,11 +607,13 @@ class PublicOntology:
         if isinstance(values, str):
             values = [values]
 
+        field = self._get_default_field(field)
+        return_field = self._get_default_field(return_field)
         return map_synonyms(
-            df=self._df,
+            df=self._ensure_columns([field, return_field, synonyms_field]),
             identifiers=values,
-            field=self._get_default_field(field),
-            return_field=self._get_default_field(return_field),
+            field=field,
+            return_field=return_field,
             return_mapper=return_mapper,
             case_sensitive=case_sensitive,
             mute=mute,
@@ -523,7 +660,7 @@ class PublicOntology:
             >>> lookup['CD103-positive dendritic cell']
         """
         return Lookup(
-            df=self._df,
+            df=self._ensure_columns(),
             field=self._get_default_field(field),
             tuple_name=self.__class__.__name__,
             prefix="bt",
@@ -563,7 +700,7 @@ class PublicOntology:
         from lamin_utils._search import search
 
         return search(
-            df=self._df,
+            df=self._ensure_columns(),
             string=string,
             field=self._get_default_field(field),
             limit=limit,
@@ -602,30 +739,47 @@ class PublicOntology:
         if self.version == compare_to.version:
             raise ValueError("The versions of the PublicOntology objects must differ.")
 
-        # The 'parents' column (among potentially others) contain Numpy array values.
-        # We transform them to tuples to determine the diff.
+        # The 'parents' column (among potentially others) contain Numpy array values,
+        # or lists in Arrow-backed columns. We transform them to tuples to determine
+        # the diff.
         def _convert_arrays_to_tuples(arr):  # pragma: no cover
-            if isinstance(arr, np.ndarray):
+            if isinstance(arr, (np.ndarray, list)):
                 return tuple(arr)
             else:
                 return arr
 
-        for bt_obj in [self, compare_to]:
-            for column in bt_obj.df().columns:
-                if any(isinstance(val, np.ndarray) for val in bt_obj.df()[column]):
-                    bt_obj._df[column] = bt_obj.df()[column].apply(
-                        _convert_arrays_to_tuples
-                    )
+        # Arrow-backed and categorical columns of `settings.memory_map` and
+        # `settings.compact_dtypes` tables are compared as objects.
+        # pd.ArrowDtype only exists in pandas>=2.
+        object_dtypes = (getattr(pd, "ArrowDtype", ()), pd.CategoricalDtype)
+
+        def _convert_column(column: pd.Series) -> pd.Series:
+            if isinstance(column.dtype, object_dtypes):
+                column = column.astype(object).where(column.notna(), None)
+            if any(isinstance(val, (np.ndarray, list)) for val in column):
+                column = column.apply(_convert_arrays_to_tuples)
+            return column
+
+        # Tables may be shared via the ontology cache, so they are not modified in place.
+        def _convert_df(df: pd.DataFrame) -> pd.DataFrame:
+            converted = {
+                column: _convert_column(df[column])
+                for column in df.columns
+                if df[column].dtype == object
+                or isinstance(df[column].dtype, object_dtypes)
+            }
+            return df.assign(**converted) if converted else df
+
+        self_df = _convert_df(self.df())
+        compare_to_df = _convert_df(compare_to.df())
 
         # New entries
-        new_entries = pd.concat([self.df(), compare_to.df()]).drop_duplicates(
-            keep=False
-        )
+        new_entries = pd.concat([self_df, compare_to_df]).drop_duplicates(keep=False)
 
         # Changes in existing entries
-        common_index = self.df().index.intersection(compare_to.df().index)
-        self_df_common = self.df().loc[common_index]
-        compare_to_df_common = compare_to.df().loc[common_index]
+        common_index = self_df.index.intersection(compare_to_df.index)
+        self_df_common = self_df.loc[common_index]
+        compare_to_df_common = compare_to_df.loc[common_index]
         modified_entries = self_df_common.compare(compare_to_df_common, **kwargs)
 
         logging.info(f"{len(new_entries)} new entries were added.")
@@ -1,7 +1,7 @@
 import os
 from functools import wraps
 from pathlib import Path
-from typing import Union
+from typing import Literal, Optional, Union
 
 HOME_DIR = Path(f"{Path.home()}/.lamin/bionty").resolve()
 ROOT_DIR = Path(__file__).parent.resolve()
@@ -46,6 +46,18 @@ class Settings:
 
         self.versionsdir.mkdir(exist_ok=True, parents=True)  # type: ignore
 
+        # the in-memory ontology cache is opt-in
+        self.ontology_cache_max_bytes = 0
+        # by default, cached files are checked against S3 for updates on every load
+        self.offline_first = False
+        self.freshness_ttl = None
+        self.memory_map = False
+        self.compact_dtypes = None
+        # dynamicdir grows without bound unless a budget is set
+        self.dynamicdir_max_bytes = None
+        # a store shared by all users of a cluster, e.g. on a shared filesystem
+        self.cas_dir = os.environ.get("BIONTY_CAS_DIR") or None
+
     @property
     def datasetdir(self):
         """Directory for datasets."""
@@ -74,8 +86,145 @@ class Settings:
         self._versionsdir = Path(versionsdir).resolve()
         self._versionsdir.mkdir(exist_ok=True, parents=True)  # type: ignore
 
+    @property
+    def ontology_cache_max_bytes(self) -> int:
+        """Memory budget in bytes of the process-wide ontology table cache.
+
+        Loaded ontology tables are shared across PublicOntology objects until the
+        budget is exceeded, then the least recently used tables are evicted.
+        Set to 0 to disable the cache (default).
+        """
+        return self._ontology_cache_max_bytes
+
+    @ontology_cache_max_bytes.setter
+    def ontology_cache_max_bytes(self, max_bytes: Optional[int]):
+        self._ontology_cache_max_bytes = int(max_bytes or 0)
+        if self._ontology_cache_max_bytes < 0:
+            raise ValueError("ontology_cache_max_bytes must be >= 0")
+
+    @property
+    def offline_first(self) -> bool:
+        """Use cached files without checking S3 for updates.
+
+        Cached files are versioned, so they are trusted as is once their md5 sum was
+        verified, e.g. while downloading them. Files that are not cached yet are
+        still downloaded.
+        """
+        return self._offline_first
+
+    @offline_first.setter
+    def offline_first(self, offline_first: bool):
+        self._offline_first = bool(offline_first)
+
+    @property
+    def freshness_ttl(self) -> Optional[float]:
+        """Seconds after which cached files are checked against S3 for updates again.
+
+        `None` checks on every load (default).
+        """
+        return self._freshness_ttl
+
+    @freshness_ttl.setter
+    def freshness_ttl(self, ttl: Optional[float]):
+        self._freshness_ttl = None if ttl is None else float(ttl)
+
+    @property
+    def memory_map(self) -> bool:
+        """Memory-map ontology tables from Arrow IPC files instead of reading them.
+
+        Cached parquet files are converted once to Arrow IPC files in `dynamicdir`.
+        Loaded tables are Arrow-backed and share the OS page cache across processes.
+        """
+        return self._memory_map
+
+    @memory_map.setter
+    def memory_map(self, memory_map: bool):
+        self._memory_map = bool(memory_map)
+
+    @property
+    def compact_dtypes(self) -> Optional[Literal["category", "arrow", "dictionary"]]:
+        """Compact dtypes of loaded ontology tables.
+
+        - `None`: default pandas dtypes (default)
+        - "arrow": Arrow-backed `pd.ArrowDtype` columns
+        - "category": low-cardinality string columns as `category`
+        - "dictionary": low-cardinality string columns dictionary-encoded and all
+          other columns as `pd.ArrowDtype`
+
+        Compare memory usage with `bionty_base.dev.memory_report()`.
+        """
+        return self._compact_dtypes
+
+    @compact_dtypes.setter
+    def compact_dtypes(
+        self, compact_dtypes: Optional[Literal["category", "arrow", "dictionary"]]
+    ):
+        if compact_dtypes not in {None, "category", "arrow", "dictionary"}:
+            raise ValueError(
+                "compact_dtypes must be one of None, 'category', 'arrow', 'dictionary'!"
+            )
+        self._compact_dtypes = compact_dtypes
+
+    @property
+    def dynamicdir_max_bytes(self) -> Optional[int]:
+        """Size budget in bytes of the cached files in `dynamicdir`.
+
+        Once exceeded after a download, the files of the least recently used sources
+        are deleted until the budget is met again. Files of the currently used sources
+        are never deleted. `None` disables the budget (default).
+
+        See `bionty_base.dev.cache_info()` for the cached files.
+        """
+        return self._dynamicdir_max_bytes
+
+    @dynamicdir_max_bytes.setter
+    def dynamicdir_max_bytes(self, max_bytes: Optional[int]):
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("dynamicdir_max_bytes must be >= 0")
+        self._dynamicdir_max_bytes = None if max_bytes is None else int(max_bytes)
+
+    @property
+    def cas_dir(self) -> Optional[Path]:
+        """Directory of a content-addressable store of cached files.
+
+        Downloaded and built files are stored once by md5 sum, e.g. on a filesystem
+        shared by all users of a cluster, and `dynamicdir` entries are hard links,
+        symlinks or copies of the stored files. `None` disables the store (default).
+
+        Defaults to the `BIONTY_CAS_DIR` environment variable.
+        """
+        return self._cas_dir
+
+    @cas_dir.setter
+    def cas_dir(self, cas_dir: Union[str, Path, None]):
+        self._cas_dir = None if cas_dir is None else Path(cas_dir).resolve()
+
+    @property
+    def freshness_index(self):
+        return self.versionsdir / ".freshness.json"
+
+    @property
+    def access_index(self):
+        return self.versionsdir / ".access.json"
+
+    @property
+    def http_validators(self):
+        return self.versionsdir / ".http_validators.json"
+
+    @property
+    def md5_index(self):
+        return self.versionsdir / ".md5.json"
+
+    @property
+    def lockdir(self):
+        return self.versionsdir / "locks"
+
     @property
     def local_sources(self):
+        # sources are synced on first use, not when bionty_base is imported
+        from ._sync_sources import ensure_sources_synced
+
+        ensure_sources_synced()
         return self.versionsdir / "sources_local.yaml"
 
     @property
@@ -84,8 +233,15 @@ class Settings:
 
     @property
     def current_sources(self):
+        from ._sync_sources import ensure_sources_synced
+
+        ensure_sources_synced()
         return self.versionsdir / ".current_sources.yaml"
 
+    @property
+    def current_sources_fingerprint(self):
+        return self.versionsdir / ".current_sources.fingerprint"
+
     @property
     def lamindb_sources(self):
         return self.versionsdir / ".lamindb_current_sources.yaml"
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from ._public_ontology import PublicOntology
+
+_METADATA_KEY = b"bionty_base"
+
+# shared memory blocks created by this process, kept alive until unshared
+_shared_blocks: dict[str, shared_memory.SharedMemory] = {}
+_untracked_lock = threading.Lock()
+
+
+def share_ontology(ontology: PublicOntology, name: str | None = None) -> str:
+    """Load the table of a PublicOntology into shared memory.
+
+    Other processes on the same host attach to the table by name with
+    :func:`attach_ontology` without loading or copying it. The shared memory
+    block lives until :func:`unshare_ontology` is called by this process.
+
+    Args:
+        ontology: The PublicOntology object to share.
+        name: Name of the shared memory block. A unique name is generated by default.
+
+    Returns:
+        The name of the shared memory block.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> name = bt.dev.share_ontology(bt.Gene(organism="human"))
+        >>> # in a worker process
+        >>> gene = bt.dev.attach_ontology(name)
+        >>> gene.validate(["A1CF", "A1BG"], field=gene.symbol)
+    """
+    import pyarrow as pa
+
+    df = ontology._ensure_columns()
+    metadata = {
+        "entity": ontology.__class__.__name__,
+        "source_record": ontology._source_record,
+        "include_id_prefixes": ontology.include_id_prefixes,
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _METADATA_KEY: json.dumps(metadata)}
+    )
+
+    # measure the size of the serialized table before allocating the block
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    block = shared_memory.SharedMemory(name=name, create=True, size=sink.size())
+    try:
+        buffer = pa.py_buffer(block.buf)
+        with pa.ipc.new_stream(
+            pa.FixedSizeBufferWriter(buffer), table.schema
+        ) as writer:
+            writer.write_table(table)
+        # release the export of the block's memory so that it can be closed later
+        del buffer
+    except Exception as e:
+        block.close()
+        block.unlink()
+        raise e
+    _shared_blocks[block.name] = block
+    return block.name
+
+
+def attach_ontology(name: str) -> PublicOntology:
+    """Attach to a PublicOntology table shared by another process.
+
+    The returned object supports `validate`, `inspect`, `standardize`, `search`
+    and `lookup`. Its table is backed by the shared memory block without copying.
+
+    Args:
+        name: Name of the shared memory block, see :func:`share_ontology`.
+
+    Returns:
+        A PublicOntology object of the shared entity.
+    """
+    import pyarrow as pa
+
+    import bionty_base
+
+    table = pa.ipc.open_stream(_map_shared_memory(name)).read_all()
+    metadata = json.loads(table.schema.metadata[_METADATA_KEY])
+
+    entity = getattr(bionty_base, metadata["entity"])
+    ontology = entity.__new__(entity)
+    ontology._source_record = metadata["source_record"]
+    ontology._organism = ontology._source_record["organism"]
+    ontology._source = ontology._source_record["source"]
+    ontology._version = ontology._source_record["version"]
+    ontology._set_file_paths()
+    ontology.include_id_prefixes = metadata["include_id_prefixes"]
+    ontology._columns = None
+    ontology._known_column_names = None
+    ontology._loaded_df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    ontology._set_column_names(list(ontology._loaded_df.columns))
+    return ontology
+
+
+def unshare_ontology(name: str) -> None:
+    """Free a shared memory block created by :func:`share_ontology`.
+
+    Attached processes keep their mapping of the table until they exit.
+    """
+    block = _shared_blocks.pop(name)
+    block.close()
+    block.unlink()
+
+
+def _map_shared_memory(name: str) -> pa.Buffer:
+    """Map an existing shared memory block into an Arrow buffer."""
+    import pyarrow as pa
+
+    if sys.version_info >= (3, 13):
+        block = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        # before Python 3.13, the resource tracker of an attaching process unlinks
+        # the block when that process exits, while it is owned by the sharing one
+        from multiprocessing import resource_tracker
+
+        with _untracked_lock:
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args: None
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+    # the buffer keeps the mapping alive, it is unmapped once no table references it
+    buffer = pa.py_buffer(memoryview(block._mmap))  # type: ignore
+    block._mmap = None  # type: ignore
+    block.close()
+    return buffer
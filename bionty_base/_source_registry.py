@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+from itertools import combinations
+from typing import TYPE_CHECKING, Iterable
+
+import pandas as pd
+
+from ._settings import settings
+from ._sync_sources import ensure_sources_synced
+from .dev._handle_sources import (
+    LAMINDB_INSTANCE_LOADED,
+    SOURCES_COLUMNS,
+    parse_sources_yaml,
+)
+from .dev._io import load_yaml
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SOURCE_KEYS = ("organism", "source", "version")
+# all combinations of the keys a source can be matched on, from none to all three
+_KEY_SUBSETS = [
+    subset
+    for n in range(len(SOURCE_KEYS) + 1)
+    for subset in combinations(SOURCE_KEYS, n)
+]
+
+
+def _file_stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SourceRegistry:
+    """Available and currently used sources indexed for constant time lookups.
+
+    The process-wide registry is obtained with :meth:`SourceRegistry.get` and is
+    rebuilt whenever the underlying sources yaml files change.
+
+    Args:
+        available_records: Records of all available sources, see
+            `.display_available_sources()`.
+        current_records: Records of the currently used sources, see
+            `.display_currently_used_sources()`.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> registry = bt.SourceRegistry.get()
+        >>> registry.match("Gene", organism="mouse")
+    """
+
+    _instance: SourceRegistry | None = None
+    _fingerprint: tuple | None = None
+    _lock = threading.Lock()
+
+    def __init__(self, available_records: list[dict], current_records: list[dict]):
+        self._available_records = available_records
+        self._current_records = current_records
+        self._available_index = self._build_index(available_records)
+        self._current_index = self._build_index(current_records)
+
+    @staticmethod
+    def _build_index(records: list[dict]) -> dict[tuple, dict]:
+        """Index records by entity and every combination of organism, source and version.
+
+        The first record of each key wins, same as the order of the yaml files.
+        """
+        index: dict[tuple, dict] = {}
+        for record in records:
+            for keys in _KEY_SUBSETS:
+                index_key = (record["entity"], keys, *(record[k] for k in keys))
+                index.setdefault(index_key, record)
+        return index
+
+    @classmethod
+    def get(cls) -> SourceRegistry:
+        """The process-wide registry of the current sources files."""
+        ensure_sources_synced()
+        current_path = (
+            settings.lamindb_sources
+            if LAMINDB_INSTANCE_LOADED()
+            else settings.current_sources
+        )
+        fingerprint = (
+            settings.local_sources,
+            _file_stat(settings.local_sources),
+            current_path,
+            _file_stat(current_path),
+        )
+        with cls._lock:
+            if cls._instance is None or cls._fingerprint != fingerprint:
+                cls._instance = cls(
+                    available_records=parse_sources_yaml(
+                        settings.local_sources
+                    ).to_dict(orient="records"),
+                    current_records=_parse_current_records(current_path),
+                )
+                cls._fingerprint = fingerprint
+            return cls._instance
+
+    def available(self, entity: str | None = None) -> list[dict]:
+        """Records of all available sources, optionally of a single entity."""
+        if entity is None:
+            return list(self._available_records)
+        return [r for r in self._available_records if r["entity"] == entity]
+
+    def current(self, entity: str | None = None) -> list[dict]:
+        """Records of the currently used sources, optionally of a single entity."""
+        if entity is None:
+            return list(self._current_records)
+        return [r for r in self._current_records if r["entity"] == entity]
+
+    def select(
+        self,
+        entity: str | Iterable[str] | None = None,
+        organism: str | Iterable[str] | None = None,
+        source: str | Iterable[str] | None = None,
+        version: str | Iterable[str] | None = None,
+        *,
+        currently_used: bool = True,
+    ) -> list[dict]:
+        """Records of all sources matching any of the passed values of each key.
+
+        Args:
+            entity: Names of entity classes. All by default.
+            organism: `name`s of `Organism` entity. All by default.
+            source: Keys of sources. All by default.
+            version: Versions of sources. All by default.
+            currently_used: Whether to select from the currently used sources
+                instead of all available sources.
+
+        Returns:
+            The entity, organism, source and version of each matching record.
+        """
+        filters = {
+            key: {value} if isinstance(value, str) else {str(v) for v in value}
+            for key, value in zip(
+                ("entity", *SOURCE_KEYS), (entity, organism, source, version)
+            )
+            if value is not None
+        }
+        records = self._current_records if currently_used else self._available_records
+        return [
+            {key: record[key] for key in ("entity", *SOURCE_KEYS)}
+            for record in records
+            if all(str(record[key]) in values for key, values in filters.items())
+        ]
+
+    def match(
+        self,
+        entity: str,
+        organism: str | None = None,
+        source: str | None = None,
+        version: str | None = None,
+        *,
+        currently_used: bool = False,
+    ) -> dict[str, str]:
+        """Match a source record based on passed organism, source and version.
+
+        Args:
+            entity: Name of the entity class, e.g. "CellType".
+            organism: `name` of `Organism` entity.
+            source: The key of the source.
+            version: The version of the source.
+            currently_used: Whether to match against the currently used sources
+                instead of all available sources.
+
+        Returns:
+            The first matching source record.
+
+        Raises:
+            ValueError: If no record matches.
+        """
+        kwargs = {
+            k: v
+            for k, v in zip(SOURCE_KEYS, (organism, source, version))
+            if v is not None
+        }
+        index = self._current_index if currently_used else self._available_index
+        record = index.get((entity, tuple(kwargs.keys()), *kwargs.values()))
+        if record is None:
+            raise ValueError(
+                f"No source is available with {kwargs}\nCheck"
+                " `.display_available_sources()`"
+            )
+        return dict(record)
+
+    def available_df(self) -> pd.DataFrame:
+        """All available sources as a DataFrame indexed by entity."""
+        return pd.DataFrame(self._available_records, columns=SOURCES_COLUMNS).set_index(
+            "entity"
+        )
+
+    def current_df(self) -> pd.DataFrame:
+        """Currently used sources as a DataFrame indexed by entity."""
+        return pd.DataFrame(
+            self._current_records, columns=["entity", *SOURCE_KEYS]
+        ).set_index("entity")
+
+
+def _parse_current_records(filepath: Path) -> list[dict]:
+    """Flatten a currently used sources yaml into records."""
+    records = []
+    for entity, entity_data in load_yaml(filepath.resolve()).items():
+        for organism, organism_data in entity_data.items():
+            for source, version in organism_data.items():
+                records.append(
+                    {
+                        "entity": entity,
+                        "organism": organism,
+                        "source": source,
+                        "version": version,
+                    }
+                )
+    return records
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Iterable, Literal
+
+import pandas as pd
+
+from .dev._cas import _tmp_path
+from .dev._io import file_lock
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pyarrow as pa
+
+    from ._public_ontology import PublicOntology
+
+# string columns with at most this fraction of unique values are dictionary-encoded
+DICTIONARY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _index_columns(schema: pa.Schema) -> list[str]:
+    """Named index columns stored in the pandas metadata of a schema."""
+    return [
+        name
+        for name in (schema.pandas_metadata or {}).get("index_columns", [])
+        if isinstance(name, str) and not name.startswith("__index_level_")
+    ]
+
+
+def parquet_column_names(path: Path) -> list[str]:
+    """Column names of a parquet file, read from its schema without loading data."""
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    index_columns = _index_columns(schema)
+    return index_columns + [
+        name
+        for name in schema.names
+        if name not in index_columns and not name.startswith("__index_level_")
+    ]
+
+
+def read_parquet_columns(
+    path: Path,
+    columns: list[str] | None = None,
+    compact_dtypes: Literal["category", "arrow", "dictionary"] | None = None,
+) -> pd.DataFrame:
+    """Read a parquet file without index, optionally only the passed columns."""
+    if compact_dtypes is None:
+        # only the requested columns are read from disk, the index is added by pandas
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        import pyarrow.parquet as pq
+
+        df = to_pandas(
+            pq.read_table(path, columns=columns, use_pandas_metadata=True),
+            compact_dtypes=compact_dtypes,
+        )
+    if df.index.name is not None:
+        df = df.reset_index()
+    return df
+
+
+def to_pandas(
+    table: pa.Table,
+    compact_dtypes: Literal["category", "arrow", "dictionary"] | None = None,
+) -> pd.DataFrame:
+    """Convert an Arrow table to a DataFrame with the requested dtypes.
+
+    Args:
+        table: The Arrow table.
+        compact_dtypes: How string columns are stored.
+
+            - `None`: default pandas dtypes
+            - "arrow": Arrow-backed `pd.ArrowDtype` columns
+            - "category": low-cardinality string columns as `category`
+            - "dictionary": low-cardinality string columns dictionary-encoded and
+              all other columns as `pd.ArrowDtype`
+    """
+    if compact_dtypes is None:
+        return table.to_pandas()
+    if compact_dtypes not in {"category", "arrow", "dictionary"}:
+        raise ValueError(
+            "compact_dtypes must be one of None, 'category', 'arrow', 'dictionary'!"
+        )
+    if compact_dtypes in {"category", "dictionary"}:
+        table = _dictionary_encode(table)
+    if compact_dtypes == "category":
+        # dictionary-encoded columns are converted to categoricals
+        return table.to_pandas()
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _dictionary_encode(table: pa.Table) -> pa.Table:
+    """Dictionary-encode string columns with few unique values."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for i, field in enumerate(table.schema):
+        if not (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            continue
+        column = table.column(i)
+        if len(column) == 0:
+            continue
+        n_unique = pc.count_distinct(column, mode="all").as_py()
+        if n_unique / len(column) <= DICTIONARY_MAX_UNIQUE_RATIO:
+            table = table.set_column(i, field.name, column.dictionary_encode())
+    return table
+
+
+def write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Write a parquet file via a temporary file, readers never see a partial file."""
+    tmp_path = _tmp_path(path)
+    try:
+        df.to_parquet(tmp_path)
+        tmp_path.replace(path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def ipc_path(parquet_path: Path) -> Path:
+    """Path of the Arrow IPC file converted from a parquet file."""
+    return parquet_path.with_suffix(".arrow")
+
+
+def convert_parquet_to_ipc(parquet_path: Path) -> Path:
+    """Convert a parquet file once to an uncompressed Arrow IPC file next to it.
+
+    The IPC file is converted again if the parquet file was updated.
+    """
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    path = ipc_path(parquet_path)
+    parquet_mtime = parquet_path.stat().st_mtime
+    if path.exists() and path.stat().st_mtime == parquet_mtime:
+        return path
+
+    # threads and processes reading the same file convert it only once
+    with file_lock(path):
+        if path.exists() and path.stat().st_mtime == parquet_mtime:
+            return path
+        table = pq.read_table(parquet_path)
+        tmp_path = _tmp_path(path)
+        try:
+            with ipc.new_file(tmp_path, table.schema) as writer:
+                writer.write_table(table)
+            # the IPC file mirrors the mtime of the parquet file it was converted from
+            os.utime(tmp_path, times=(parquet_mtime, parquet_mtime))
+            tmp_path.replace(path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    return path
+
+
+def read_memory_mapped_columns(
+    parquet_path: Path,
+    columns: list[str] | None = None,
+    compact_dtypes: Literal["category", "arrow", "dictionary"] | None = None,
+) -> pd.DataFrame:
+    """Memory-map the Arrow IPC file of a parquet file into an Arrow-backed DataFrame.
+
+    The columns of the returned DataFrame reference the memory-mapped buffers, so
+    no data is copied and processes reading the same file share the page cache.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    path = convert_parquet_to_ipc(parquet_path)
+    table = ipc.open_file(pa.memory_map(path.as_posix(), "r")).read_all()
+    if columns is not None:
+        # same as for parquet files, named index columns are always read
+        index_columns = _index_columns(table.schema)
+        table = table.select(
+            list(dict.fromkeys([*index_columns, *columns]))
+        ).replace_schema_metadata(table.schema.metadata)
+    if compact_dtypes in {"category", "dictionary"}:
+        df = to_pandas(table, compact_dtypes=compact_dtypes)
+    else:
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    if df.index.name is not None:
+        df = df.reset_index()
+    return df
+
+
+def memory_report(
+    ontologies: Iterable[PublicOntology],
+    compact_dtypes: Literal["category", "arrow", "dictionary"] = "dictionary",
+) -> pd.DataFrame:
+    """Memory of ontology tables with default and with compact dtypes.
+
+    Args:
+        ontologies: PublicOntology objects whose cached tables are compared.
+        compact_dtypes: The compact dtypes mode, see `settings.compact_dtypes`.
+
+    Returns:
+        A DataFrame indexed by entity with the bytes held by each table.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.dev.memory_report([bt.Gene(organism="human"), bt.Gene(organism="mouse")])
+    """
+    rows = []
+    for ontology in ontologies:
+        path = ontology._local_parquet_path
+        if not path.exists():
+            continue
+        nbytes_default = read_parquet_columns(path).memory_usage(deep=True).sum()
+        nbytes_compact = (
+            read_parquet_columns(path, compact_dtypes=compact_dtypes)
+            .memory_usage(deep=True)
+            .sum()
+        )
+        rows.append(
+            {
+                "entity": ontology.__class__.__name__,
+                "organism": ontology.organism,
+                "source": ontology.source,
+                "version": ontology.version,
+                "bytes_default": int(nbytes_default),
+                "bytes_compact": int(nbytes_compact),
+                "ratio": nbytes_compact / nbytes_default,
+            }
+        )
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "entity",
+            "organism",
+            "source",
+            "version",
+            "bytes_default",
+            "bytes_compact",
+            "ratio",
+        ],
+    ).set_index("entity")
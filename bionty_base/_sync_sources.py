@@ -1,3 +1,6 @@
+import hashlib
+import threading
+
 from filelock import FileLock  # type: ignore
 
 from ._settings import settings
@@ -6,10 +9,61 @@ from .dev._handle_sources import (
     create_or_update_sources_local_yaml,
 )
 
+# the versionsdir the sources were last synced to in this process
+_synced_versionsdir = None
+# the sync reads the sources files through settings, which sync on first use
+_sync_lock = threading.RLock()
+_syncing = False
+
+
+def _sources_fingerprint() -> str:
+    """Fingerprint of the public and local sources the current sources derive from."""
+    md5 = hashlib.md5()
+    for path in (settings.public_sources, settings.local_sources):
+        try:
+            md5.update(path.read_bytes())
+        except FileNotFoundError:
+            md5.update(b"\0")
+    return md5.hexdigest()
+
+
+def _sources_up_to_date() -> bool:
+    """Whether the current sources were derived from unchanged sources files."""
+    if not settings.current_sources.exists() or not settings.local_sources.exists():
+        return False
+    try:
+        synced_fingerprint = settings.current_sources_fingerprint.read_text()
+    except FileNotFoundError:
+        return False
+    return synced_fingerprint == _sources_fingerprint()
+
 
 def sync_sources():
-    # Make this code safe when running bionty from multiple processes
-    with FileLock(settings.versionsdir / "bionty_base.lock"):
-        create_or_update_sources_local_yaml(overwrite=False)
-        # always generate a new CURRENT_SOURCES file
-        create_currently_used_sources_yaml(overwrite=True)
+    global _synced_versionsdir, _syncing
+
+    with _sync_lock:
+        _syncing = True
+        try:
+            # skip the lock if another process already synced the same sources files
+            if not _sources_up_to_date():
+                # Make this code safe when running bionty from multiple processes
+                with FileLock(settings.versionsdir / "bionty_base.lock"):
+                    if not _sources_up_to_date():
+                        create_or_update_sources_local_yaml(overwrite=False)
+                        create_currently_used_sources_yaml(overwrite=True)
+                        fingerprint_path = settings.current_sources_fingerprint
+                        tmp_path = fingerprint_path.with_suffix(".tmp")
+                        tmp_path.write_text(_sources_fingerprint())
+                        tmp_path.replace(fingerprint_path)
+        finally:
+            _syncing = False
+        _synced_versionsdir = settings.versionsdir
+
+
+def ensure_sources_synced():
+    """Sync sources once per process and versionsdir, on first use instead of at import."""
+    if _synced_versionsdir == settings.versionsdir:
+        return
+    with _sync_lock:
+        if _synced_versionsdir != settings.versionsdir and not _syncing:
+            sync_sources()
@@ -4,6 +4,75 @@
    :toctree: .
 
    InspectResult
+   ontology_cache_stats
+   clear_ontology_cache
+   io_stats
+   memory_report
+   share_ontology
+   attach_ontology
+   unshare_ontology
+   prefetch
+   export_bundle
+   import_bundle
+   async_url_download
+   async_s3_bionty_assets
+   gather_downloads
+   cache_info
+   evict_cache
 """
 
-from lamin_utils._inspect import InspectResult
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# public attributes are imported on first access to keep `import bionty_base` cheap
+_LAZY_ATTRS = {
+    "InspectResult": "lamin_utils._inspect",
+    "ontology_cache_stats": "bionty_base._ontology_cache",
+    "clear_ontology_cache": "bionty_base._ontology_cache",
+    "io_stats": "bionty_base.dev._io",
+    "memory_report": "bionty_base._storage",
+    "share_ontology": "bionty_base._shared_memory",
+    "attach_ontology": "bionty_base._shared_memory",
+    "unshare_ontology": "bionty_base._shared_memory",
+    "prefetch": "bionty_base.dev._prefetch",
+    "export_bundle": "bionty_base.dev._bundle",
+    "import_bundle": "bionty_base.dev._bundle",
+    "async_url_download": "bionty_base.dev._async_io",
+    "async_s3_bionty_assets": "bionty_base.dev._async_io",
+    "gather_downloads": "bionty_base.dev._async_io",
+    "cache_info": "bionty_base.dev._cache",
+    "evict_cache": "bionty_base.dev._cache",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if TYPE_CHECKING:
+    from lamin_utils._inspect import InspectResult
+
+    from bionty_base._ontology_cache import clear_ontology_cache, ontology_cache_stats
+    from bionty_base._shared_memory import (
+        attach_ontology,
+        share_ontology,
+        unshare_ontology,
+    )
+    from bionty_base._storage import memory_report
+    from bionty_base.dev._async_io import (
+        async_s3_bionty_assets,
+        async_url_download,
+        gather_downloads,
+    )
+    from bionty_base.dev._bundle import export_bundle, import_bundle
+    from bionty_base.dev._cache import cache_info, evict_cache
+    from bionty_base.dev._io import io_stats
+    from bionty_base.dev._prefetch import prefetch
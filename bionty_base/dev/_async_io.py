@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, TypeVar
+from urllib.parse import urlsplit
+
+from ._io import _split_assets_base_url, s3_bionty_assets, url_download
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+T = TypeVar("T")
+
+MAX_CONCURRENCY = 8
+MAX_PER_HOST = 4
+
+
+class _DownloadLimits:
+    """Caps of the downloads running at the same time, in total and per host."""
+
+    def __init__(self, max_concurrency: int, max_per_host: int):
+        if max_concurrency < 1 or max_per_host < 1:
+            raise ValueError("max_concurrency and max_per_host must be >= 1")
+        self._total = asyncio.Semaphore(max_concurrency)
+        self._max_per_host = max_per_host
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def acquire(self, host: str) -> AsyncIterator[None]:
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self._max_per_host)
+        async with self._hosts[host], self._total:
+            yield
+
+
+# limits of the downloads started by `gather_downloads`, unlimited otherwise
+_download_limits: ContextVar[_DownloadLimits | None] = ContextVar(
+    "download_limits", default=None
+)
+
+
+async def _run_limited(host: str, func: partial) -> Any:
+    """Run a blocking download in the default executor within the current limits."""
+    loop = asyncio.get_running_loop()
+    limits = _download_limits.get()
+    if limits is None:
+        return await loop.run_in_executor(None, func)
+    async with limits.acquire(host):
+        return await loop.run_in_executor(None, func)
+
+
+async def async_url_download(
+    url: str, localpath: str | Path | None = None, **kwargs
+) -> Any:
+    """Downloads a file to a specified path without blocking the event loop.
+
+    The download runs in a thread of the event loop's default executor, see
+    `url_download` for the arguments and return values.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> await bt.dev.async_url_download("https://example.org/pw.obo", "pw.obo")
+    """
+    return await _run_limited(
+        urlsplit(url).netloc, partial(url_download, url, localpath, **kwargs)
+    )
+
+
+async def async_s3_bionty_assets(
+    filename: str,
+    localpath: Path | None = None,
+    assets_base_url: str = "s3://bionty-assets",
+    **kwargs,
+) -> Any:
+    """Synchronizes a S3 file path with local file storage without blocking.
+
+    The synchronization runs in a thread of the event loop's default executor, see
+    `s3_bionty_assets` for the arguments and return values.
+    """
+    endpoint_url, bucket = _split_assets_base_url(assets_base_url)
+    host = (
+        f"{bucket}.s3.amazonaws.com"
+        if endpoint_url is None
+        else urlsplit(endpoint_url).netloc
+    )
+    return await _run_limited(
+        host,
+        partial(
+            s3_bionty_assets,
+            filename,
+            localpath=localpath,
+            assets_base_url=assets_base_url,
+            **kwargs,
+        ),
+    )
+
+
+async def gather_downloads(
+    *downloads: Awaitable[T],
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_per_host: int = MAX_PER_HOST,
+    return_exceptions: bool = False,
+) -> list[T]:
+    """Run downloads concurrently with a limit in total and per host.
+
+    Limits apply to the `async_url_download` and `async_s3_bionty_assets` calls of
+    the passed coroutines. Each `url_download` may still make parallel range
+    requests.
+
+    Args:
+        downloads: Coroutines of `async_url_download` or `async_s3_bionty_assets`.
+        max_concurrency: Maximal number of downloads at the same time.
+        max_per_host: Maximal number of downloads from the same host at the same time.
+        return_exceptions: Whether exceptions are returned as results instead of
+            raised, see `asyncio.gather`.
+
+    Returns:
+        The results of the downloads in the order they were passed.
+
+    Examples:
+        >>> import asyncio
+        >>> import bionty_base as bt
+        >>> asyncio.run(
+        ...     bt.dev.gather_downloads(
+        ...         *(bt.dev.async_url_download(url, path) for url, path in files),
+        ...         max_concurrency=16,
+        ...     )
+        ... )
+    """
+    token = _download_limits.set(_DownloadLimits(max_concurrency, max_per_host))
+    try:
+        # tasks copy the current context, so they keep the limits when it's reset
+        tasks = [asyncio.ensure_future(download) for download in downloads]
+    finally:
+        _download_limits.reset(token)
+    return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from pathlib import Path
+from typing import Iterable
+
+from lamin_utils import logger
+
+from bionty_base._settings import settings
+
+from ._io import _record_freshness
+from ._md5 import calculate_md5, record_md5
+from ._prefetch import _lazy_ontology
+
+MANIFEST_NAME = "manifest.json"
+BUNDLE_FORMAT = 1
+CHUNK_SIZE = 1024 * 1024
+
+
+def export_bundle(
+    path: str | Path,
+    entity: str | Iterable[str] | None = None,
+    organism: str | Iterable[str] | None = None,
+    source: str | Iterable[str] | None = None,
+    version: str | Iterable[str] | None = None,
+    *,
+    currently_used: bool = True,
+) -> Path:
+    """Pack the cached files of sources into a bundle for offline machines.
+
+    The bundle is a gzipped tar archive of the parquet and ontology source files in
+    `settings.dynamicdir` and a manifest with their md5 sums. Sources that are not
+    cached are skipped, see :func:`prefetch` to cache them first.
+
+    Args:
+        path: Path of the bundle to write.
+        entity: Entity class names to export, e.g. "Gene". All by default.
+        organism: Organisms to export. All by default.
+        source: Sources to export. All by default.
+        version: Versions to export. All by default.
+        currently_used: Whether to export only the currently used sources or
+            all available sources.
+
+    Returns:
+        The path of the bundle.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.dev.prefetch(entity="CellType")
+        >>> bt.dev.export_bundle("celltype.tar.gz", entity="CellType")
+    """
+    from bionty_base._source_registry import SourceRegistry
+
+    path = Path(path)
+    records = SourceRegistry.get().select(
+        entity=entity,
+        organism=organism,
+        source=source,
+        version=version,
+        currently_used=currently_used,
+    )
+
+    files: dict[str, dict] = {}
+    for record in records:
+        ontology = _lazy_ontology(record)
+        if not ontology._local_parquet_path.exists():
+            logger.warning(
+                f"{record['entity']} {record['organism']} {record['source']}"
+                f" {record['version']} is not cached, skipping"
+            )
+            continue
+        localpaths = [ontology._local_parquet_path]
+        if ontology._local_ontology_path is not None:
+            localpaths.append(ontology._local_ontology_path)
+        for localpath in localpaths:
+            if not localpath.exists() or localpath.name in files:
+                continue
+            md5 = calculate_md5(localpath)
+            # ontology source files are checked against the md5 of sources.yaml
+            is_source_file = localpath == ontology._local_ontology_path
+            if is_source_file and ontology._md5 and md5 != ontology._md5:
+                logger.warning(f"md5 sum of {localpath} did not match, skipping")
+                continue
+            files[localpath.name] = {**record, "md5": md5}
+
+    manifest = json.dumps(
+        {"format": BUNDLE_FORMAT, "files": files}, indent=2, sort_keys=True
+    ).encode()
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tarfile.open(tmp_path, "w:gz") as tar:
+            # the manifest comes first, bundles are verified while streaming
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(manifest)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(manifest))
+            for filename in files:
+                tar.add(settings.dynamicdir / filename, arcname=filename)
+        tmp_path.replace(path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    logger.success(f"exported {len(files)} files to {path}")
+    return path
+
+
+def import_bundle(path: str | Path) -> list[Path]:
+    """Import a bundle written by :func:`export_bundle` into `settings.dynamicdir`.
+
+    Files are extracted while streaming the bundle and verified against the md5 sums
+    of its manifest before they are moved into place. Imported files count as
+    freshly checked for `settings.freshness_ttl`. With `settings.offline_first`,
+    PublicOntology objects of the imported sources are created without network calls.
+
+    Args:
+        path: Path of the bundle.
+
+    Returns:
+        The paths of the imported files.
+
+    Raises:
+        ValueError: If the bundle is invalid or a file does not match its md5 sum.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.settings.offline_first = True
+        >>> bt.dev.import_bundle("celltype.tar.gz")
+        >>> bt.CellType()
+    """
+    dynamicdir = settings.dynamicdir
+    dynamicdir.mkdir(parents=True, exist_ok=True)
+    imported = []
+    with tarfile.open(path, "r|*") as tar:
+        files = None
+        for member in tar:
+            if files is None:
+                if member.name != MANIFEST_NAME:
+                    raise ValueError(f"{path} is not a bundle, no manifest found!")
+                manifest = json.load(tar.extractfile(member))  # type: ignore
+                files = manifest["files"]
+                continue
+            if not member.isfile() or member.name not in files:
+                raise ValueError(f"{member.name} is not listed in the manifest!")
+            if Path(member.name).name != member.name:
+                raise ValueError(f"{member.name} is not a valid file name!")
+            localpath = dynamicdir / member.name
+            _extract_verified(
+                tar.extractfile(member),  # type: ignore
+                localpath=localpath,
+                md5=files[member.name]["md5"],
+                mtime=member.mtime,
+            )
+            _record_freshness(localpath)
+            imported.append(localpath)
+    if files is None:
+        raise ValueError(f"{path} is not a bundle, no manifest found!")
+    missing = set(files) - {localpath.name for localpath in imported}
+    if len(missing) > 0:
+        raise ValueError(f"files of the manifest are missing: {sorted(missing)}")
+    logger.success(f"imported {len(imported)} files from {path}")
+    return imported
+
+
+def _extract_verified(
+    fileobj: io.BufferedReader, localpath: Path, md5: str, mtime: float
+) -> None:
+    """Write a file via a temporary file, only if it matches the md5 sum."""
+    tmp_path = localpath.with_name(f"{localpath.name}.{os.getpid()}.tmp")
+    hash_md5 = hashlib.md5()
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                hash_md5.update(chunk)
+                f.write(chunk)
+        if hash_md5.hexdigest() != md5:
+            raise ValueError(f"md5 sum of {localpath.name} did not match {md5}!")
+        # keep the mtime of the exported file, newer versions on S3 are still fetched
+        os.utime(tmp_path, times=(mtime, mtime))
+        tmp_path.replace(localpath)
+        # verified files are trusted with `settings.offline_first`
+        record_md5(localpath, md5)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+from filelock import Timeout  # type: ignore
+from lamin_utils import logger
+
+from bionty_base._settings import settings
+
+from ._io import COMPRESSION_SUFFIXES, file_lock
+from ._json_index import JsonIndex
+
+CACHE_INFO_COLUMNS = [
+    "entity",
+    "organism",
+    "source",
+    "version",
+    "bytes",
+    "files",
+    "last_access",
+    "pinned",
+]
+
+# accesses of the same file are recorded at most this often, in seconds
+ACCESS_RESOLUTION = 60.0
+
+# last access of cached files by path
+_access_index = JsonIndex(
+    lambda: settings.access_index, keep=lambda path, _: Path(path).exists()
+)
+
+# files that are being written or that coordinate writers are never evicted
+_TRANSIENT_SUFFIXES = (".lock", ".part", ".part.json", ".tmp")
+
+
+def record_access(localpath: Path) -> None:
+    """Record that a cached file was just used, see `evict_cache`."""
+    now = time.time()
+    key = localpath.absolute().as_posix()
+    if now - _access_index.get(key, 0.0) < ACCESS_RESOLUTION:
+        return
+    with _access_index.update() as index:
+        index[key] = now
+
+
+def _strip_suffix(name: str, suffixes: Iterable[str]) -> str:
+    for suffix in suffixes:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def _source_key(filename: str) -> tuple[str, str, str, str] | None:
+    """Entity, organism, source and version of a cached file from its name.
+
+    Spaces are replaced by underscores, as in the names of ontology source files.
+    """
+    if filename.endswith(_TRANSIENT_SUFFIXES):
+        return None
+    if filename.startswith("df_"):
+        name = _strip_suffix(filename[len("df_") :], (".parquet", ".arrow"))
+    elif filename.startswith("ontology_"):
+        name = _strip_suffix(filename[len("ontology_") :], COMPRESSION_SUFFIXES)
+    else:
+        return None
+    parts = name.replace(" ", "_").split("__")
+    if len(parts) != 4:
+        return None
+    organism, source, version, entity = parts
+    return entity, organism, source, version
+
+
+def _cached_sources() -> dict[tuple[str, str, str, str], list[tuple[Path, int, float]]]:
+    """Path, size and last access of the cached files of each source."""
+    if not settings.dynamicdir.exists():
+        return {}
+    index = _access_index.copy()
+    sources: dict = {}
+    for path in settings.dynamicdir.iterdir():
+        key = _source_key(path.name)
+        if key is None:
+            continue
+        try:
+            # symlinks to a shared store take no space in dynamicdir
+            stat = path.lstat()
+        except FileNotFoundError:
+            continue
+        last_access = index.get(path.absolute().as_posix())
+        if last_access is None:
+            # files that were never read count as accessed when they were cached
+            last_access = max(stat.st_mtime, stat.st_ctime)
+        sources.setdefault(key, []).append((path, stat.st_size, last_access))
+    return sources
+
+
+def _pinned_sources() -> set[tuple[str, str, str, str]]:
+    """Keys of the currently used sources."""
+    from bionty_base._source_registry import SourceRegistry
+
+    return {
+        tuple(
+            str(record[key]).replace(" ", "_")
+            for key in ("entity", "organism", "source", "version")
+        )
+        for record in SourceRegistry.get().current()
+    }  # type: ignore
+
+
+def cache_info() -> pd.DataFrame:
+    """Report the cached files in `settings.dynamicdir` by source.
+
+    Returns:
+        A DataFrame with the bytes, number of files and last access of the cached
+        files of each entity, organism, source and version, most recently used first.
+        Files of `pinned` sources are currently used and never evicted.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> info = bt.dev.cache_info()
+        >>> info.groupby("entity")["bytes"].sum()
+    """
+    pinned = _pinned_sources()
+    rows = [
+        (
+            *key,
+            sum(size for _, size, _ in files),
+            len(files),
+            max(last_access for _, _, last_access in files),
+            key in pinned,
+        )
+        for key, files in _cached_sources().items()
+    ]
+    df = pd.DataFrame(rows, columns=CACHE_INFO_COLUMNS)
+    df["last_access"] = pd.to_datetime(df["last_access"], unit="s")
+    return df.sort_values("last_access", ascending=False, ignore_index=True)
+
+
+def evict_cache(
+    max_bytes: int | None = None, *, keep: Iterable[Path] = ()
+) -> list[Path]:
+    """Delete the files of the least recently used sources until the cache fits.
+
+    Files of the currently used sources and files that are being downloaded or built
+    by other threads or processes are not deleted.
+
+    Args:
+        max_bytes: The size budget in bytes of `settings.dynamicdir`, defaults to
+            `settings.dynamicdir_max_bytes`. Nothing is deleted if both are `None`.
+        keep: Cached files whose sources are not deleted.
+
+    Returns:
+        The paths of the deleted files.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.dev.evict_cache(max_bytes=2 * 1024**3)
+    """
+    if max_bytes is None:
+        max_bytes = settings.dynamicdir_max_bytes
+    if max_bytes is None:
+        return []
+    sources = _cached_sources()
+    total = sum(size for files in sources.values() for _, size, _ in files)
+    if total <= max_bytes:
+        return []
+
+    protected = _pinned_sources() | {_source_key(path.name) for path in keep}
+    evictable = sorted(
+        (files for key, files in sources.items() if key not in protected),
+        key=lambda files: max(last_access for _, _, last_access in files),
+    )
+    deleted = []
+    for files in evictable:
+        if total <= max_bytes:
+            break
+        for path, size, _ in files:
+            lock = file_lock(path)
+            try:
+                lock.acquire(timeout=0)
+            except Timeout:
+                continue
+            try:
+                path.unlink(missing_ok=True)
+            finally:
+                lock.release()
+            total -= size
+            deleted.append(path)
+
+    with _access_index.update() as index:
+        for path in deleted:
+            index.pop(path.absolute().as_posix(), None)
+    if total > max_bytes:
+        logger.warning(
+            f"cached files in {settings.dynamicdir} take {total} bytes, more than"
+            f" dynamicdir_max_bytes={max_bytes}, as they are in use"
+        )
+    return deleted
+
+
+def _enforce_budget(keep: Path) -> None:
+    """Evict the least recently used sources if `settings.dynamicdir_max_bytes` is set."""
+    if settings.dynamicdir_max_bytes is not None:
+        evict_cache(keep=[keep])
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from typing import TYPE_CHECKING
+
+from lamin_utils import logger
+
+from bionty_base._settings import settings
+
+from ._md5 import calculate_md5, record_md5
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _object_path(md5: str) -> Path:
+    """Path of the stored file of an md5 sum."""
+    return settings.cas_dir / md5[:2] / md5  # type: ignore
+
+
+def _ref_path(filename: str) -> Path:
+    """Path of the file recording the md5 sum of the last stored file of a name."""
+    return settings.cas_dir / "refs" / filename  # type: ignore
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _read_ref(filename: str) -> str | None:
+    try:
+        return _ref_path(filename).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_ref(filename: str, md5: str) -> None:
+    ref_path = _ref_path(filename)
+    if _read_ref(filename) == md5:
+        return
+    ref_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _tmp_path(ref_path)
+    tmp_path.write_text(md5)
+    tmp_path.replace(ref_path)
+
+
+def _link(object_path: Path, localpath: Path, copy: bool = True) -> bool:
+    """Atomically replace localpath with a hard link, symlink or copy of a stored file.
+
+    Hard links need the store on the same filesystem, symlinks need the store to be
+    reachable from all hosts under the same path.
+
+    Returns:
+        False if localpath was not replaced as it could only be copied.
+    """
+    tmp_path = _tmp_path(localpath)
+    try:
+        try:
+            os.link(object_path, tmp_path)
+        except OSError:
+            try:
+                tmp_path.symlink_to(object_path)
+            except OSError:
+                if not copy:
+                    return False
+                shutil.copy2(object_path, tmp_path)
+        tmp_path.replace(localpath)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return True
+
+
+def materialize(localpath: Path, md5: str = "") -> bool:
+    """Link a cached file to its stored file in `settings.cas_dir`.
+
+    Args:
+        localpath: The path of the cached file.
+        md5: The md5 sum of the file. If empty, the md5 sum of the last file
+            stored with the same name is used.
+
+    Returns:
+        True if localpath was linked to a stored file, False otherwise, e.g. if the
+        store is not readable.
+    """
+    if settings.cas_dir is None:
+        return False
+    try:
+        md5 = md5 or _read_ref(localpath.name) or ""
+        if not md5 or not _object_path(md5).exists():
+            return False
+        localpath.parent.mkdir(parents=True, exist_ok=True)
+        _link(_object_path(md5), localpath)
+    except OSError as e:
+        # the file is downloaded instead
+        logger.debug(f"could not link {localpath} to {settings.cas_dir}: {e}")
+        return False
+    record_md5(localpath, md5)
+    return True
+
+
+def store(localpath: Path, md5: str = "") -> Path | None:
+    """Store a cached file in `settings.cas_dir` and link it to the stored file.
+
+    Stored files are read-only and never modified in place, they are shared by all
+    links to them.
+
+    Args:
+        localpath: The path of the cached file.
+        md5: The md5 sum of the file, calculated if empty.
+
+    Returns:
+        The path of the stored file, None if there is no store or cached file, or if
+        the store is not writable.
+    """
+    if settings.cas_dir is None or not localpath.exists():
+        return None
+    md5 = md5 or calculate_md5(localpath)
+    object_path = _object_path(md5)
+    try:
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = _tmp_path(object_path)
+            try:
+                try:
+                    os.link(localpath, tmp_path)
+                except OSError:
+                    shutil.copy2(localpath, tmp_path)
+                tmp_path.chmod(0o444)
+                tmp_path.replace(object_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        _write_ref(localpath.name, md5)
+        # copies are not replaced by another copy
+        linked = not localpath.samefile(object_path) and _link(
+            object_path, localpath, copy=False
+        )
+    except OSError as e:
+        # the store is an optimization, the cached file is used as is
+        logger.debug(f"could not store {localpath} in {settings.cas_dir}: {e}")
+        return None
+    if linked:
+        record_md5(localpath, md5)
+    return object_path
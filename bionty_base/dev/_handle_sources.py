@@ -1,11 +1,16 @@
+import hashlib
+import os
+import pickle
+import time
 from pathlib import Path
-from typing import Dict, List, Literal, Union
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
 import pandas as pd
+import yaml  # type:ignore
 from lamin_utils import logger
 
 from bionty_base._settings import settings
-from bionty_base.dev._io import load_yaml, write_yaml
+from bionty_base.dev._io import load_yaml, write_pickle, write_yaml
 
 
 def LAMINDB_INSTANCE_LOADED():
@@ -22,6 +27,7 @@ def reset_sources(confirm: bool = False) -> None:
     from importlib import reload
 
     import bionty_base
+    from bionty_base._sync_sources import sync_sources
 
     def _confirm() -> bool:
         """Ask user to enter Y or N (case-insensitive).
@@ -58,6 +64,7 @@ def reset_sources(confirm: bool = False) -> None:
             pass
 
         reload(bionty_base)
+        sync_sources()
         logger.info("reloaded bionty!")
 
 
@@ -79,26 +86,36 @@ def create_or_update_sources_local_yaml(overwrite: bool = True) -> None:
         update_local_from_public_sources_yaml()
 
 
-def parse_sources_yaml(
-    filepath: Union[str, Path] = settings.public_sources,
-) -> pd.DataFrame:
-    """Parse values from sources yaml file into a DataFrame.
+SOURCES_COLUMNS = [
+    "entity",
+    "source",
+    "organism",
+    "version",
+    "url",
+    "md5",
+    "source_name",
+    "source_website",
+]
 
-    Args:
-        filepath: Path to the versions yaml file.
+# compiled sources are trusted based on file stats only if the file was not
+# modified within this window before compiling, otherwise the hash is compared
+_RACY_WINDOW_NS = 2_000_000_000
 
-    Returns:
-        - entity
-        - source
-        - organism
-        - version
-        - url
-        - md5
-        - source_name
-        - source_website
-    """
+_compiled_sources: Dict[str, Dict] = {}
+
+
+def _compiled_sources_path(filepath: Path) -> Optional[Path]:
+    """Path of the on-disk compiled index, only kept for the bionty sources files."""
+    if filepath == settings.public_sources:
+        return settings.versionsdir / ".sources.pkl"
+    elif filepath == settings.local_sources:
+        return settings.versionsdir / ".sources_local.pkl"
+    return None
+
+
+def _parse_sources_rows(content: bytes) -> List[Tuple]:
     all_rows = []
-    for entity, sources in load_yaml(filepath).items():
+    for entity, sources in yaml.safe_load(content).items():
         if entity == "version":
             continue
         for source, organism_source in sources.items():
@@ -119,22 +136,84 @@ def parse_sources_yaml(
                         website,
                     )
                     all_rows.append(row)
+    return all_rows
+
 
-    return pd.DataFrame(
-        all_rows,
-        columns=[
-            "entity",
-            "source",
-            "organism",
-            "version",
-            "url",
-            "md5",
-            "source_name",
-            "source_website",
-        ],
+def _is_fresh(compiled: Optional[Dict], stat: os.stat_result) -> bool:
+    return (
+        compiled is not None
+        and compiled["mtime_ns"] == stat.st_mtime_ns
+        and compiled["size"] == stat.st_size
+        and compiled["compiled_at_ns"] - stat.st_mtime_ns > _RACY_WINDOW_NS
     )
 
 
+def _load_compiled_sources(filepath: Path) -> List[Tuple]:
+    """Rows of a sources yaml, reused until the file changes."""
+    key = filepath.as_posix()
+    stat = filepath.stat()
+    compiled = _compiled_sources.get(key)
+    if _is_fresh(compiled, stat):
+        return compiled["rows"]  # type: ignore
+
+    index_path = _compiled_sources_path(filepath)
+    if compiled is None and index_path is not None and index_path.exists():
+        try:
+            with open(index_path, "rb") as f:
+                compiled = pickle.load(f)
+        except Exception:
+            compiled = None
+        if _is_fresh(compiled, stat):
+            _compiled_sources[key] = compiled  # type: ignore
+            return compiled["rows"]  # type: ignore
+
+    content = filepath.read_bytes()
+    content_md5 = hashlib.md5(content).hexdigest()
+    if compiled is not None and compiled["md5"] == content_md5:
+        rows = compiled["rows"]
+    else:
+        rows = _parse_sources_rows(content)
+    compiled = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "md5": content_md5,
+        "compiled_at_ns": time.time_ns(),
+        "rows": rows,
+    }
+    _compiled_sources[key] = compiled
+    if index_path is not None:
+        try:
+            write_pickle(compiled, index_path)
+        except OSError:  # pragma: no cover
+            pass
+    return rows
+
+
+def parse_sources_yaml(
+    filepath: Union[str, Path] = settings.public_sources,
+) -> pd.DataFrame:
+    """Parse values from sources yaml file into a DataFrame.
+
+    The parsed records are compiled into a pickled index in `settings.versionsdir`,
+    which is reused until the yaml file changes.
+
+    Args:
+        filepath: Path to the versions yaml file.
+
+    Returns:
+        - entity
+        - source
+        - organism
+        - version
+        - url
+        - md5
+        - source_name
+        - source_website
+    """
+    rows = _load_compiled_sources(Path(filepath).resolve())
+    return pd.DataFrame(rows, columns=SOURCES_COLUMNS)
+
+
 def create_currently_used_sources_yaml(
     overwrite: bool = True, source: Literal["versions", "local"] = "local"
 ) -> None:
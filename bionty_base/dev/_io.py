@@ -1,12 +1,99 @@
+import bz2
+import gzip
+import hashlib
+import json
+import lzma
 import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Union
+from typing import IO, Any, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import requests  # type:ignore
 import yaml  # type:ignore
+from filelock import FileLock  # type: ignore
+from lamin_utils import logger
+from requests.adapters import HTTPAdapter
 from rich.progress import Progress
 
 from bionty_base._settings import settings
+from bionty_base.dev._json_index import JsonIndex
+from bionty_base.dev._md5 import calculate_md5, record_md5, recorded_md5
+
+# counters of remote calls, see `io_stats()`
+_io_stats: Counter = Counter()
+# last time cached files were checked for freshness against S3
+_freshness_index = JsonIndex(
+    lambda: settings.freshness_index, keep=lambda path, _: Path(path).exists()
+)
+# ETag and Last-Modified of downloaded URLs with the files they were downloaded to
+_http_validators = JsonIndex(
+    lambda: settings.http_validators,
+    keep=lambda _, entry: Path(entry["file"][0]).exists(),
+)
+
+
+def io_stats() -> Dict[str, int]:
+    """Counters of remote calls made and avoided by this process.
+
+    Returns:
+        A dictionary with
+
+        - `"remote_checks"`: S3 requests made to check or download cached files
+        - `"remote_checks_avoided"`: checks skipped because of
+          `settings.offline_first`, `settings.freshness_ttl` or a recent listing
+        - `"list_requests"`: S3 list requests, see `list_s3_assets`
+        - `"downloads"`, `"bytes_downloaded"`: files and bytes downloaded from S3
+        - `"bytes_avoided"`: bytes of S3 files not downloaded because the cached
+          files were up to date
+        - `"not_modified"`: `url_download` calls answered with 304 Not Modified
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.settings.offline_first = True
+        >>> bt.CellType()
+        >>> bt.dev.io_stats()
+    """
+    return {
+        "remote_checks": 0,
+        "remote_checks_avoided": 0,
+        "list_requests": 0,
+        "downloads": 0,
+        "bytes_downloaded": 0,
+        "bytes_avoided": 0,
+        "not_modified": 0,
+        **_io_stats,
+    }
+
+
+def _record_freshness(localpath: Path) -> None:
+    """Record that a cached file was just checked against its remote."""
+    with _freshness_index.update() as index:
+        index[localpath.resolve().as_posix()] = time.time()
+
+
+def _trust_cached_file(localpath: Path) -> bool:
+    """Whether a cached file is used without checking its remote for updates.
+
+    Only files with a recorded md5 sum that are unchanged since are trusted, e.g.
+    complete downloads, not files that were modified or truncated.
+    """
+    if not localpath.exists() or recorded_md5(localpath) is None:
+        return False
+    if settings.offline_first:
+        return True
+    if settings.freshness_ttl is None:
+        return False
+    last_checked = _freshness_index.get(localpath.resolve().as_posix())
+    return last_checked is not None and time.time() - last_checked < (
+        settings.freshness_ttl
+    )
 
 
 def load_yaml(
@@ -22,130 +109,823 @@ def write_yaml(
     sort_keys: bool = False,
     default_flow_style: bool = False,
 ):  # pragma: no cover
-    with open(filename, "w") as f:
-        yaml.dump(
-            data,
-            f,
-            sort_keys=sort_keys,
-            default_flow_style=default_flow_style,
-        )
+    # write to a temporary file and rename, concurrent readers never see a partial file
+    filename = Path(filename)
+    tmp_filename = filename.with_name(f"{filename.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_filename, "w") as f:
+            yaml.dump(
+                data,
+                f,
+                sort_keys=sort_keys,
+                default_flow_style=default_flow_style,
+            )
+        tmp_filename.replace(filename)
+    finally:
+        if tmp_filename.exists():
+            tmp_filename.unlink()
+
+
+def write_pickle(data, filename: Union[str, Path]) -> None:
+    """Atomically pickle data to a file, concurrent readers never see a partial file."""
+    filename = Path(filename)
+    tmp_filename = filename.with_name(f"{filename.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_filename, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_filename.replace(filename)
+    finally:
+        if tmp_filename.exists():
+            tmp_filename.unlink()
+
+
+class _DownloadProgress:
+    """A progress bar for large downloads, updated at most every 0.1 seconds."""
+
+    MIN_SIZE = 5000000
+    UPDATE_INTERVAL = 0.1
+
+    def __init__(self, total: int):
+        self._total = total
+        self._progress: Optional[Progress] = None
+        self._pending = 0
+        self._last_update = 0.0
+
+    def __enter__(self) -> "_DownloadProgress":
+        if self._total > self.MIN_SIZE:
+            self._progress = Progress(refresh_per_second=10, transient=True)
+            self._progress.__enter__()
+            self._task = self._progress.add_task(
+                "[red]downloading...", total=self._total
+            )
+        return self
+
+    def advance(self, nbytes: int) -> None:
+        if self._progress is None:
+            return
+        self._pending += nbytes
+        now = time.monotonic()
+        if now - self._last_update >= self.UPDATE_INTERVAL:
+            self._progress.update(self._task, advance=self._pending)
+            self._pending = 0
+            self._last_update = now
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._progress is None:
+            return
+        if exc_type is None:
+            # force the progress bar to 100% at the end
+            self._progress.update(self._task, completed=self._total, refresh=True)
+        self._progress.__exit__(exc_type, exc_value, traceback)
+
+
+# shared HTTP session, pools connections across downloads and threads
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+# files larger than one chunk are downloaded in parallel if the server supports ranges
+RANGE_CHUNK_SIZE = 8 * 1024**2
+DOWNLOAD_WORKERS = 8
+BUFFER_SIZE = 1024**2
+
+
+def _get_http_session() -> requests.Session:
+    global _http_session
+
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def _content_range(response: requests.Response) -> Optional[Tuple[int, int]]:
+    """First byte and total size of a file from the Content-Range of a response."""
+    match = re.fullmatch(
+        r"bytes (\d+)-\d+/(\d+)", response.headers.get("content-range", "").strip()
+    )
+    return None if match is None else (int(match.group(1)), int(match.group(2)))
+
+
+def file_lock(localpath: Union[str, Path]) -> FileLock:
+    """Lock of a cached file, held by the process downloading or building it.
+
+    The lock is reentrant within a thread, other threads and processes wait. Lock
+    files are kept in `settings.lockdir`, not next to the cached files.
+    """
+    path = Path(localpath).absolute()
+    Path(localpath).parent.mkdir(parents=True, exist_ok=True)
+    settings.lockdir.mkdir(parents=True, exist_ok=True)
+    # files of the same name in different directories have different locks
+    directory = hashlib.md5(path.parent.as_posix().encode()).hexdigest()[:16]
+    return FileLock(
+        settings.lockdir / f"{path.name}.{directory}.lock", is_singleton=True
+    )
+
+
+# compressed source files are cached as is and decompressed while they are parsed
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
+
+def compression_suffix(url: Union[str, Path]) -> str:
+    """Compression suffix of a file URL or path, empty if it is not compressed."""
+    path = urlsplit(str(url)).path
+    for suffix in COMPRESSION_SUFFIXES:
+        if path.endswith(suffix):
+            return suffix
+    return ""
+
+
+def open_decompressed(path: Union[str, Path]) -> IO[bytes]:
+    """Open a file for reading, decompressing it on the fly based on its suffix.
+
+    Args:
+        path: Path to a file, compressed if it ends with one of `COMPRESSION_SUFFIXES`.
+
+    Returns:
+        A binary file object of the decompressed content.
+
+    Raises:
+        ModuleNotFoundError: If a `.zst` file is opened without `zstandard` installed.
+    """
+    suffix = compression_suffix(path)
+    if suffix == ".gz":
+        return gzip.open(path, "rb")
+    elif suffix == ".bz2":
+        return bz2.open(path, "rb")
+    elif suffix == ".xz":
+        return lzma.open(path, "rb")
+    elif suffix == ".zst":
+        try:
+            import zstandard
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError(
+                "To read zstd-compressed files, please run `pip install zstandard`"
+            ) from None
+        return zstandard.open(path, "rb")
+    return open(path, "rb")
+
+
+def _part_path(localpath: Path) -> Path:
+    """Path of the partial file a download is written to."""
+    return localpath.with_name(f"{localpath.name}.part")
+
+
+def _resumable_part(part_path: Path, source: str) -> Tuple[int, Optional[str]]:
+    """Bytes and validator of a partial download of source that can be resumed.
+
+    A partial file is only resumed if the validator (ETag or Last-Modified) of the
+    remote file it was started from is known, otherwise it's downloaded again.
+    """
+    try:
+        with open(f"{part_path}.json") as f:
+            meta = json.load(f)
+        offset = part_path.stat().st_size
+    except (FileNotFoundError, ValueError):
+        return 0, None
+    if meta.get("source") != source or meta.get("validator") is None or offset == 0:
+        return 0, None
+    return offset, meta["validator"]
+
+
+def _part_size(part_path: Path) -> int:
+    try:
+        return part_path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _start_part(part_path: Path, source: str, validator: Optional[str]) -> None:
+    """Record the remote file a new partial download is started from."""
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{part_path}.json", "w") as f:
+        json.dump({"source": source, "validator": validator}, f)
+
+
+def _finish_part(
+    part_path: Path,
+    localpath: Path,
+    digest: str,
+    md5: str = "",
+    mtime: Optional[float] = None,
+) -> None:
+    """Verify a completed partial download and atomically move it into place.
+
+    The md5 sum is recorded, later verifications of the file don't read it again.
+
+    Args:
+        part_path: The partial file.
+        localpath: The path the file is moved to.
+        digest: The md5 sum of the partial file, computed while downloading it.
+        md5: The expected md5 sum, not verified if empty.
+        mtime: The modification time to set on the file.
+
+    Raises:
+        ValueError: If the file does not match the expected md5 sum.
+    """
+    meta_path = Path(f"{part_path}.json")
+    if len(md5) > 0 and digest != md5:
+        part_path.unlink()
+        meta_path.unlink(missing_ok=True)
+        raise ValueError(f"MD5 sum for {localpath} did not match {md5}.")
+    if mtime is not None:
+        os.utime(part_path, times=(mtime, mtime))
+    part_path.replace(localpath)
+    meta_path.unlink(missing_ok=True)
+    record_md5(localpath, digest)
+
+
+class _HashingFile:
+    """Writes to a partial file and computes the md5 sum of its content.
+
+    Bytes of an earlier, interrupted download are hashed once when the file is
+    opened to resume it, all other bytes are hashed as they are written.
+    """
+
+    def __init__(self, part_path: Path, offset: int = 0):
+        self.md5 = hashlib.md5()
+        if offset > 0:
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(BUFFER_SIZE), b""):
+                    self.md5.update(chunk)
+        self._file = open(part_path, "ab" if offset > 0 else "wb")
+
+    def write(self, data: bytes) -> None:
+        self.md5.update(data)
+        self._file.write(data)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def __enter__(self) -> "_HashingFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._file.close()
+
+
+# errors of interrupted transfers, after which a download is resumed
+_RESUMABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+    requests.exceptions.Timeout,
+)
+
+
+def _conditional_headers(url: str, localpath: Path) -> Dict[str, str]:
+    """Headers of a request of url that is answered with 304 if localpath is current.
+
+    Only files that are unchanged since they were downloaded from url are
+    revalidated, otherwise the file is requested unconditionally.
+    """
+    entry = _http_validators.get(url)
+    try:
+        stat = localpath.stat()
+    except FileNotFoundError:
+        return {}
+    if entry is None or entry["file"] != [
+        localpath.absolute().as_posix(),
+        stat.st_size,
+        stat.st_mtime_ns,
+    ]:
+        return {}
+    headers = {}
+    if entry.get("etag") is not None:
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified") is not None:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _record_http_validators(
+    url: str, localpath: Path, response_headers: Mapping[str, str]
+) -> None:
+    """Record the ETag and Last-Modified of url with the file it was downloaded to."""
+    etag = response_headers.get("etag")
+    last_modified = response_headers.get("last-modified")
+    if etag is None and last_modified is None:
+        if _http_validators.get(url) is not None:
+            with _http_validators.update() as index:
+                index.pop(url, None)
+        return
+    stat = localpath.stat()
+    with _http_validators.update() as index:
+        index[url] = {
+            "file": [localpath.absolute().as_posix(), stat.st_size, stat.st_mtime_ns],
+            "etag": etag,
+            "last_modified": last_modified,
+        }
 
 
 def url_download(
-    url: str, localpath: Union[str, Path, None] = None, block_size: int = 1024, **kwargs
-) -> Union[str, Path, None]:
+    url: str,
+    localpath: Union[str, Path, None] = None,
+    block_size: int = BUFFER_SIZE,
+    max_workers: int = DOWNLOAD_WORKERS,
+    md5: str = "",
+    retries: int = 3,
+    return_md5: bool = False,
+    **kwargs,
+) -> Union[str, Path, None, Tuple[Union[str, Path], str]]:
     """Downloads a file to a specified path.
 
+    The first `RANGE_CHUNK_SIZE` bytes are requested with an HTTP Range request. If
+    the server supports ranges, the rest of the file is downloaded in chunks with
+    parallel range requests, otherwise the file is streamed over a single connection.
+
+    The file is written to `localpath` with a `.part` suffix and only moved into
+    place once it is complete and matches `md5`. The md5 sum is computed while the
+    file is downloaded. Interrupted downloads are resumed from the last byte
+    written, also by later calls.
+
+    The ETag and Last-Modified of the URL are recorded. If `localpath` was
+    downloaded from the URL before and is unchanged, it's revalidated with a
+    conditional request and not downloaded again if the server answers with
+    304 Not Modified.
+
     Args:
         url: The URL to download.
         localpath: The path to download the file to.
-        block_size: Buffer size in bytes for sending a file-like message body.
+        block_size: Buffer size in bytes for reading the response.
+        max_workers: Maximal number of parallel range requests.
+        md5: The expected md5 sum of the file, not verified if empty.
+        retries: Number of times an interrupted download is resumed. Downloads
+            that fail before writing any bytes are not retried.
+        return_md5: Whether to also return the md5 sum of the downloaded file.
         **kwargs: Keyword arguments are passed to 'requests'
 
     Returns:
-        The localpath file is downloaded to
+        The localpath file is downloaded to, and its md5 sum if `return_md5`. The md5
+        sum is None if the file was not modified.
 
     Raises:
         HttpError: If the request response is not 200 and OK.
+        ValueError: If the downloaded file does not match `md5`.
     """
-    try:
-        response = requests.get(url, stream=True, allow_redirects=True, **kwargs)
-        response.raise_for_status()
+    from bionty_base.dev._md5 import verify_md5
 
-        total_content_length = int(response.headers.get("content-length", 0))
-        if localpath is None:
-            localpath = url.split("/")[-1]
+    if localpath is None:
+        localpath = url.split("/")[-1]
+    part_path = _part_path(Path(localpath))
 
-        if total_content_length > 5000000:
-            with Progress(refresh_per_second=10, transient=True) as progress:
-                task = progress.add_task(
-                    "[red]downloading...", total=total_content_length
+    # only one process writes the partial file at a time
+    with file_lock(localpath):
+        conditional_headers = _conditional_headers(url, Path(localpath))
+        # a cached file that doesn't match md5 is downloaded again
+        if conditional_headers and len(md5) > 0 and not verify_md5(localpath, md5):
+            conditional_headers = {}
+        for attempt in range(retries + 1):
+            size = _part_size(part_path)
+            try:
+                result = _download_part(
+                    url,
+                    part_path,
+                    block_size=block_size,
+                    max_workers=max_workers,
+                    conditional_headers=conditional_headers,
+                    **kwargs,
                 )
+                if result is None:
+                    _io_stats["not_modified"] += 1
+                    return (localpath, None) if return_md5 else localpath
+                break
+            except _RESUMABLE_ERRORS as e:
+                # failures before any byte arrived, e.g. without internet access,
+                # are not retried
+                if attempt == retries or _part_size(part_path) <= size:
+                    raise e
+                logger.warning(f"download of {url} failed, resuming: {e}")
+        digest, response_headers = result
+        _finish_part(part_path, Path(localpath), digest=digest, md5=md5)
+        _record_http_validators(url, Path(localpath), response_headers)
+    return (localpath, digest) if return_md5 else localpath
+
+
+def _download_part(
+    url: str,
+    part_path: Path,
+    block_size: int,
+    max_workers: int,
+    conditional_headers: Dict[str, str],
+    **kwargs,
+) -> Optional[Tuple[str, Mapping[str, str]]]:
+    """Download a file to its partial file, resuming from the bytes already there.
+
+    Returns:
+        The md5 sum of the downloaded file and the headers of the response, None if
+        the server answered the conditional request with 304 Not Modified.
+    """
+    session = _get_http_session()
+    headers = kwargs.pop("headers", None) or {}
+    offset, validator = _resumable_part(part_path, source=url)
+    # partial downloads are resumed without revalidating the cached file
+    first_headers = {**headers, **conditional_headers} if offset == 0 else headers
+
+    response = None
+    if max_workers > 1 or offset > 0:
+        # ranges refer to the encoded bytes, the file is requested without encoding
+        end = offset + RANGE_CHUNK_SIZE - 1 if max_workers > 1 else ""
+        range_headers = {
+            **first_headers,
+            "Range": f"bytes={offset}-{end}",
+            "Accept-Encoding": "identity",
+        }
+        if validator is not None:
+            # the server sends the full file if it changed since the partial download
+            range_headers["If-Range"] = validator
+        response = session.get(
+            url, stream=True, allow_redirects=True, headers=range_headers, **kwargs
+        )
+        content_range = _content_range(response)
+        # e.g. empty files or files of unknown size are requested without range
+        if response.status_code == 416 or (
+            response.status_code == 206
+            and (content_range is None or content_range[0] != offset)
+        ):
+            response.close()
+            response = None
+    if response is None:
+        response = session.get(
+            url, stream=True, allow_redirects=True, headers=first_headers, **kwargs
+        )
 
-                with open(localpath, "wb") as file:
-                    for data in response.iter_content(block_size):
-                        file.write(data)
-                        progress.update(task, advance=block_size)
-                # force the progress bar to 100% at the end
-                progress.update(task, completed=total_content_length, refresh=True)
+    try:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        if response.status_code == 206:
+            offset, total_content_length = _content_range(response)  # type: ignore
+        else:
+            offset = 0
+            total_content_length = int(response.headers.get("content-length", 0))
+        if offset == 0:
+            etag = response.headers.get("etag")
+            _start_part(
+                part_path,
+                source=url,
+                # weak ETags can't be used for ranges
+                validator=etag
+                if etag is not None and not etag.startswith("W/")
+                else response.headers.get("last-modified"),
+            )
         else:
-            with open(localpath, "wb") as file:
+            logger.info(f"resuming download of {url} at byte {offset}")
+
+        with _DownloadProgress(total_content_length) as progress:
+            progress.advance(offset)
+            with _HashingFile(part_path, offset=offset) as file:
                 for data in response.iter_content(block_size):
                     file.write(data)
+                    progress.advance(len(data))
+                if response.status_code == 206 and file.tell() < total_content_length:
+                    # the ranges are requested from the final url after redirects
+                    _download_ranges(
+                        session,
+                        response.url,
+                        file,
+                        progress,
+                        total_content_length,
+                        max_workers=max_workers,
+                        headers=headers,
+                        **kwargs,
+                    )
+        return file.md5.hexdigest(), response.headers
+    finally:
+        response.close()
+
+
+def _download_ranges(
+    session: requests.Session,
+    url: str,
+    file: _HashingFile,
+    progress: _DownloadProgress,
+    total_content_length: int,
+    max_workers: int,
+    headers: dict,
+    **kwargs,
+) -> None:
+    """Download the rest of a file with parallel range requests.
+
+    Chunks are appended in order, at most `2 * max_workers` chunks are held in
+    memory, so the file is always a prefix of the remote file that can be resumed.
+    """
+
+    def fetch(start: int) -> bytes:
+        end = min(start + RANGE_CHUNK_SIZE, total_content_length) - 1
+        response = session.get(
+            url,
+            allow_redirects=True,
+            headers={
+                **headers,
+                "Range": f"bytes={start}-{end}",
+                "Accept-Encoding": "identity",
+            },
+            **kwargs,
+        )
+        response.raise_for_status()
+        if response.status_code != 206 or len(response.content) != end - start + 1:
+            raise requests.exceptions.ContentDecodingError(
+                f"invalid response to the range request {start}-{end} of {url}"
+            )
+        return response.content
+
+    starts = iter(range(file.tell(), total_content_length, RANGE_CHUNK_SIZE))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        window: deque = deque(
+            pool.submit(fetch, start) for start in islice(starts, 2 * max_workers)
+        )
+        try:
+            while window:
+                data = window.popleft().result()
+                file.write(data)
+                progress.advance(len(data))
+                for start in islice(starts, 1):
+                    window.append(pool.submit(fetch, start))
+        finally:
+            for future in window:
+                future.cancel()
+
+
+# unsigned S3 clients by endpoint, created once and shared by all threads
+_s3_clients: Dict[Optional[str], Any] = {}
+_s3_clients_lock = threading.Lock()
+
+
+def _split_assets_base_url(assets_base_url: str) -> Tuple[Optional[str], str]:
+    """Endpoint URL and bucket of an assets base URL.
+
+    `s3://bucket` is a bucket on AWS S3, `http(s)://host/bucket` is a bucket on an
+    S3-compatible endpoint.
+    """
+    if assets_base_url.startswith("s3://"):
+        return None, assets_base_url[len("s3://") :].strip("/")
+    endpoint_url, _, bucket = assets_base_url.rstrip("/").rpartition("/")
+    if not endpoint_url.startswith(("http://", "https://")) or not bucket:
+        raise ValueError(
+            f"{assets_base_url} is neither an s3:// URL nor the URL of a bucket!"
+        )
+    return endpoint_url, bucket
+
 
-        return localpath
+def _get_s3_client(endpoint_url: Optional[str] = None):
+    """The unsigned S3 client of an endpoint, AWS S3 by default."""
+    with _s3_clients_lock:
+        if endpoint_url not in _s3_clients:
+            import botocore.session as session
+            from botocore.config import Config
 
-    except requests.exceptions.HTTPError as err:
-        raise err
+            config = Config(
+                signature_version=session.UNSIGNED,
+                max_pool_connections=DOWNLOAD_WORKERS * 2,
+                retries={"max_attempts": 3, "mode": "standard"},
+                tcp_keepalive=True,
+                # buckets of S3-compatible endpoints are addressed by path
+                s3={"addressing_style": "auto" if endpoint_url is None else "path"},
+            )
+            _s3_clients[endpoint_url] = session.get_session().create_client(
+                "s3",
+                region_name=None if endpoint_url is None else "us-east-1",
+                endpoint_url=endpoint_url,
+                config=config,
+            )
+        return _s3_clients[endpoint_url]
 
 
 def s3_bionty_assets(
-    filename: str, localpath: Path = None, assets_base_url: str = "s3://bionty-assets"
+    filename: str,
+    localpath: Path = None,
+    assets_base_url: str = "s3://bionty-assets",
+    md5: str = "",
+    return_md5: bool = False,
 ):
     """Synchronizes a S3 file path with local file storage.
 
     If the file does not exist locally it gets downloaded to datasetdir/filename or the passed localpath.
     If the file does not exist on S3, the file does not get synchronized, no erroring.
+    Cached files are checked for updates with a HEAD request, or against a recent
+    listing of `list_s3_assets`, and only downloaded if S3 has a newer version.
+    Existing local files are used without contacting S3 if `settings.offline_first`
+    is set or if they were checked within `settings.freshness_ttl` seconds, and if
+    S3 is unreachable.
+
+    Files are downloaded to a `.part` file, which is moved into place once it is
+    complete and matches `md5`, computed while downloading. Interrupted downloads
+    are resumed by later calls.
 
     Args:
         filename: The suffix of the assets_base_url.
         localpath: Local base path of the file to sync.
-        assets_base_url: The S3 base URL. Prefix of the filename.
+        assets_base_url: The S3 base URL. Prefix of the filename. Either
+            `s3://bucket` or the URL of a bucket on an S3-compatible endpoint, e.g.
+            `http://localhost:9000/bucket`.
+        md5: The expected md5 sum of the file, not verified if empty.
+        return_md5: Whether to also return the md5 sum of the downloaded file, None
+            if the cached file was up to date.
 
     Returns:
-        A Path object of the synchronized path.
-    """
-    import botocore.session as session
-    from botocore.config import Config
+        A Path object of the synchronized path, and the md5 sum if `return_md5`.
 
+    Raises:
+        ValueError: If the downloaded file does not match `md5`.
+    """
     if localpath is None:
         localpath = settings.datasetdir / filename
     elif localpath.is_dir():
         localpath = localpath / filename
 
-    bucket = assets_base_url.replace("s3://", "")
-    s3_client = session.get_session().create_client(
-        "s3", config=Config(signature_version=session.UNSIGNED)
-    )
+    digest = None
+    if _trust_cached_file(localpath):
+        _io_stats["remote_checks_avoided"] += 1
+    else:
+        # one process checks and downloads the file, the others wait and reuse it
+        with file_lock(localpath):
+            if _trust_cached_file(localpath):
+                _io_stats["remote_checks_avoided"] += 1
+            else:
+                digest = _sync_s3_object(filename, localpath, assets_base_url, md5=md5)
+    return (localpath, digest) if return_md5 else localpath
 
-    try:
-        s3_object = s3_client.get_object(Bucket=bucket, Key=filename)
-    except s3_client.exceptions.ClientError:
-        return localpath
 
-    cloud_mts = s3_object["LastModified"].timestamp()
-    total_content_length = int(s3_object["ContentLength"])
+def _sync_s3_object(
+    filename: str, localpath: Path, assets_base_url: str, md5: str = ""
+) -> Optional[str]:
+    """Download an S3 object if it is newer than the cached file.
 
-    CHUNK_SIZE = 64 * 1024
+    Returns:
+        The md5 sum of the downloaded file, None if it was not downloaded.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
 
-    if not localpath.exists() or cloud_mts > localpath.stat().st_mtime:  # type: ignore
-        localpath.parent.mkdir(parents=True, exist_ok=True)
-        stream = s3_object["Body"]
-        if total_content_length > 5000000:
-            with Progress(refresh_per_second=10, transient=True) as progress:
-                task = progress.add_task(
-                    "[red]downloading...", total=total_content_length
+    endpoint_url, bucket = _split_assets_base_url(assets_base_url)
+    s3_client = _get_s3_client(endpoint_url)
+    part_path = _part_path(localpath)
+    source = f"{assets_base_url}/{filename}"
+    offset, validator = _resumable_part(part_path, source=source)
+
+    corrupted = False
+    try:
+        s3_object = None
+        if offset > 0:
+            _io_stats["remote_checks"] += 1
+            try:
+                s3_object = s3_client.get_object(
+                    Bucket=bucket,
+                    Key=filename,
+                    Range=f"bytes={offset}-",
+                    IfMatch=validator,
                 )
-                try:
-                    with localpath.open(mode="wb") as f:
-                        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
-                            f.write(chunk)
-                            progress.update(task, advance=CHUNK_SIZE)
-                except Exception as e:
-                    if localpath.exists():
-                        localpath.unlink()
+            except ClientError as e:
+                # the object changed since the partial download or it is complete
+                if e.response["Error"]["Code"] not in {
+                    "PreconditionFailed",
+                    "InvalidRange",
+                    "412",
+                    "416",
+                }:
                     raise e
-                # force the progress bar to 100% at the end
-                progress.update(task, completed=total_content_length, refresh=True)
+                offset = 0
         else:
-            try:
-                with localpath.open(mode="wb") as f:
-                    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
-                        f.write(chunk)
-            except Exception as e:
-                if localpath.exists():
-                    localpath.unlink()
-                raise e
-        os.utime(localpath, times=(cloud_mts, cloud_mts))
-
-    return localpath
+            # only the metadata is requested to check if the cached file is fresh
+            metadata = _listed_s3_object(endpoint_url, bucket, filename)
+            if metadata is not None:
+                _io_stats["remote_checks_avoided"] += 1
+            elif localpath.exists():
+                _io_stats["remote_checks"] += 1
+                metadata = s3_client.head_object(Bucket=bucket, Key=filename)
+            # listings have a higher precision than the mtime set from LastModified
+            if (
+                metadata is not None
+                and localpath.exists()
+                and int(metadata["LastModified"].timestamp())
+                <= localpath.stat().st_mtime
+            ):
+                if _matches_s3_object(localpath, metadata):
+                    _io_stats["bytes_avoided"] += int(metadata["ContentLength"])
+                    _record_freshness(localpath)
+                    return None
+                # a truncated or corrupted cached file is downloaded again
+                logger.warning(f"cached {localpath} does not match {source}")
+                corrupted = True
+        if s3_object is None:
+            _io_stats["remote_checks"] += 1
+            s3_object = s3_client.get_object(Bucket=bucket, Key=filename)
+    except (ClientError, _S3ObjectNotListed):
+        return None
+    except BotoCoreError as e:
+        # S3 is unreachable, e.g. no internet access, fall back to the cached file
+        if localpath.exists():
+            logger.warning(f"could not check {filename} for updates: {e}")
+            return None
+        raise e
+
+    cloud_mts = s3_object["LastModified"].timestamp()
+    total_content_length = offset + int(s3_object["ContentLength"])
+
+    CHUNK_SIZE = 1024**2
+
+    stream = s3_object["Body"]
+    if (
+        corrupted or not localpath.exists() or cloud_mts > localpath.stat().st_mtime  # type: ignore
+    ):
+        if offset == 0:
+            _start_part(part_path, source=source, validator=s3_object.get("ETag"))
+        else:
+            logger.info(f"resuming download of {filename} at byte {offset}")
+        with _DownloadProgress(total_content_length) as progress:
+            progress.advance(offset)
+            with _HashingFile(part_path, offset=offset) as f:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    f.write(chunk)
+                    progress.advance(len(chunk))
+                    _io_stats["bytes_downloaded"] += len(chunk)
+        digest = f.md5.hexdigest()
+        _finish_part(part_path, localpath, digest=digest, md5=md5, mtime=cloud_mts)
+        _io_stats["downloads"] += 1
+    else:
+        digest = None
+        stream.close()
+    _record_freshness(localpath)
+
+    return digest
+
+
+def _matches_s3_object(localpath: Path, metadata: Mapping[str, Any]) -> bool:
+    """Whether a cached file has the size and, if known, the md5 sum of an S3 object.
+
+    The ETag of objects that were not uploaded in parts is their md5 sum. The md5
+    sum of the cached file is recorded, so it's trusted by `_trust_cached_file`.
+    """
+    if localpath.stat().st_size != int(metadata["ContentLength"]):
+        return False
+    file_md5 = calculate_md5(localpath)
+    etag = (metadata.get("ETag") or "").strip('"')
+    return re.fullmatch(r"[0-9a-f]{32}", etag) is None or file_md5 == etag
+
+
+# listings of buckets by endpoint and bucket: (time listed, prefix, objects by key)
+_s3_listings: Dict[Tuple[Optional[str], str], Tuple[float, str, Dict[str, dict]]] = {}
+_s3_listings_lock = threading.Lock()
+# listings are used for freshness checks instead of HEAD requests for this long
+S3_LISTING_TTL = 300.0
+
+
+class _S3ObjectNotListed(Exception):
+    pass
+
+
+def list_s3_assets(
+    assets_base_url: str = "s3://bionty-assets", prefix: str = ""
+) -> Dict[str, dict]:
+    """List the objects of an assets bucket in batches of 1000 per request.
+
+    For the next `S3_LISTING_TTL` seconds, `s3_bionty_assets` checks the freshness
+    of cached files against the listing instead of requesting their metadata one by
+    one, e.g. while prefetching many sources.
+
+    Args:
+        assets_base_url: The S3 base URL, see `s3_bionty_assets`.
+        prefix: Only list objects whose keys start with this prefix.
+
+    Returns:
+        The `LastModified`, `ContentLength` and `ETag` of the objects by key.
+    """
+    endpoint_url, bucket = _split_assets_base_url(assets_base_url)
+    paginator = _get_s3_client(endpoint_url).get_paginator("list_objects_v2")
+    objects = {}
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        _io_stats["list_requests"] += 1
+        for obj in page.get("Contents", []):
+            objects[obj["Key"]] = {
+                "LastModified": obj["LastModified"],
+                "ContentLength": obj["Size"],
+                "ETag": obj.get("ETag"),
+            }
+    with _s3_listings_lock:
+        _s3_listings[(endpoint_url, bucket)] = (time.monotonic(), prefix, objects)
+    return objects
+
+
+def _listed_s3_object(
+    endpoint_url: Optional[str], bucket: str, key: str
+) -> Optional[dict]:
+    """Metadata of an object from a recent listing, None if it was not listed.
+
+    Raises:
+        _S3ObjectNotListed: If the object does not exist according to the listing.
+    """
+    with _s3_listings_lock:
+        listing = _s3_listings.get((endpoint_url, bucket))
+    if listing is None:
+        return None
+    listed_at, prefix, objects = listing
+    if time.monotonic() - listed_at > S3_LISTING_TTL or not key.startswith(prefix):
+        return None
+    if key not in objects:
+        raise _S3ObjectNotListed(key)
+    return objects[key]
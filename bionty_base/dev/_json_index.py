@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from filelock import FileLock  # type: ignore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_MISSING = object()
+
+
+class JsonIndex:
+    """A dictionary persisted in a JSON file, shared by all threads of a process.
+
+    The file is read on first access, and again if its path changes, e.g. with
+    `settings.versionsdir`. Only the entries changed by this process are written,
+    they are merged into the file as other processes left it. Changes are written
+    through a temporary file that is renamed into place, readers in other processes
+    never see a partial file.
+
+    Args:
+        path: Returns the path of the JSON file.
+        keep: Returns whether an entry is kept when the file is written, e.g. only
+            entries of files that still exist.
+    """
+
+    def __init__(
+        self,
+        path: Callable[[], Path],
+        keep: Callable[[str, Any], bool] | None = None,
+    ):
+        self._path = path
+        self._keep = keep
+        self._loaded_path: Path | None = None
+        self._data: dict = {}
+        # keys set or deleted by this process since the file was last written
+        self._changed: set[str] = set()
+        self._deleted: set[str] = set()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _read(path: Path) -> dict:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _load(self) -> dict:
+        path = self._path()
+        if path != self._loaded_path:
+            self._data = self._read(path)
+            self._loaded_path = path
+            self._changed, self._deleted = set(), set()
+        return self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._load().get(key, default)
+
+    def copy(self) -> dict:
+        with self._lock:
+            return dict(self._load())
+
+    @contextmanager
+    def update(self, save: bool = True) -> Iterator[dict]:
+        """Change the entries under the lock, and write them unless `save` is False.
+
+        Entries are replaced, not modified in place.
+        """
+        with self._lock:
+            data = self._load()
+            before = dict(data)
+            yield data
+            changed = {k for k, v in data.items() if before.get(k, _MISSING) is not v}
+            deleted = before.keys() - data.keys()
+            self._changed = (self._changed - deleted) | changed
+            self._deleted = (self._deleted - changed) | deleted
+            if save:
+                self.save()
+
+    def save(self) -> None:
+        """Write the entries changed since they were last written."""
+        with self._lock:
+            if not self._changed and not self._deleted:
+                return
+            data = self._load()
+            path = self._path()
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            try:
+                # processes write one at a time, each on top of the last
+                with FileLock(path.with_name(f"{path.name}.lock")):
+                    merged = self._read(path)
+                    for key in self._deleted:
+                        merged.pop(key, None)
+                    merged.update({key: data[key] for key in self._changed})
+                    if self._keep is not None:
+                        for key in [
+                            k for k, v in merged.items() if not self._keep(k, v)
+                        ]:
+                            del merged[key]
+                    with open(tmp_path, "w") as f:
+                        json.dump(merged, f)
+                    tmp_path.replace(path)
+            except OSError:  # pragma: no cover
+                return
+            self._data = merged
+            self._changed, self._deleted = set(), set()
+
+    def clear(self) -> None:
+        """Forget the entries in memory, they are read from the file again."""
+        with self._lock:
+            self._loaded_path = None
+            self._data = {}
+            self._changed, self._deleted = set(), set()
@@ -1,6 +1,29 @@
 import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterable, List, Optional, Union
+
+from bionty_base.dev._json_index import JsonIndex
+
+# files are hashed in blocks of this size
+BUFFER_SIZE = 1024**2
+
+# files modified this recently may change again within the same mtime, their md5
+# sums are not recorded
+_RACY_WINDOW_NS = 2 * 10**9
+
+
+def _md5_index_path() -> Path:
+    from bionty_base._settings import settings
+
+    return settings.md5_index
+
+
+# md5 sums of files by resolved path: [size, mtime_ns, inode, md5]
+# records of deleted files are dropped
+_md5_index = JsonIndex(_md5_index_path, keep=lambda path, _: Path(path).exists())
 
 
 def verify_md5(file_path: Union[Path, str], expected_md5: str) -> bool:
@@ -24,19 +47,99 @@ def verify_md5(file_path: Union[Path, str], expected_md5: str) -> bool:
 def calculate_md5(file_path: Union[Path, str]) -> str:
     """Calculates the md5 sum of a file.
 
+    The md5 sums of files are recorded with their size, mtime and inode, and are
+    only calculated again once the file changed.
+
     Args:
         file_path: Path to the file to calculate the md5 sum for.
 
     Returns:
         The md5 sum.
     """
-    with open(file_path, "rb") as f:
-        md5 = hashlib.md5()
-        while True:
-            data = f.read(8192)
-            if not data:
-                break
-            md5.update(data)
-        file_md5 = md5.hexdigest()
+    file_md5 = _calculate_md5(file_path)
+    _save_md5_index()
+    return file_md5
+
+
+def calculate_md5_many(
+    file_paths: Iterable[Union[Path, str]], max_workers: Optional[int] = None
+) -> Dict[Union[Path, str], str]:
+    """Calculates the md5 sums of many files in parallel.
+
+    Args:
+        file_paths: Paths to the files to calculate the md5 sums for.
+        max_workers: Maximal number of files hashed at the same time.
+
+    Returns:
+        The md5 sums by path.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> from bionty_base.dev._md5 import calculate_md5_many
+        >>> calculate_md5_many(bt.settings.dynamicdir.glob("*.parquet"))
+    """
+    file_paths = list(file_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        md5s: List[str] = list(pool.map(_calculate_md5, file_paths))
+    _save_md5_index()
+    return dict(zip(file_paths, md5s))
+
+
+def record_md5(file_path: Union[Path, str], file_md5: str) -> None:
+    """Record the md5 sum of a file that was computed otherwise, e.g. while downloading."""
+    _record_md5(Path(file_path), file_md5)
+    _save_md5_index()
+
+
+def _index_key(file_path: Path) -> str:
+    return file_path.resolve().as_posix()
+
+
+def _stat_key(stat: os.stat_result) -> list:
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
 
+
+def recorded_md5(file_path: Union[Path, str]) -> Optional[str]:
+    """The recorded md5 sum of a file, None if it was not recorded or the file changed."""
+    file_path = Path(file_path)
+    entry = _md5_index.get(_index_key(file_path))
+    if entry is None or entry[:3] != _stat_key(file_path.stat()):
+        return None
+    return entry[3]
+
+
+def _calculate_md5(file_path: Union[Path, str]) -> str:
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    entry = _md5_index.get(_index_key(file_path))
+    if entry is not None and entry[:3] == _stat_key(stat):
+        return entry[3]
+
+    md5 = hashlib.md5()
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            md5.update(view[:n])
+    file_md5 = md5.hexdigest()
+    # the file may have changed while it was hashed
+    if (
+        _stat_key(file_path.stat()) == _stat_key(stat)
+        and time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS
+    ):
+        _record_md5(file_path, file_md5, stat)
     return file_md5
+
+
+def _record_md5(
+    file_path: Path, file_md5: str, stat: Optional[os.stat_result] = None
+) -> None:
+    if stat is None:
+        stat = file_path.stat()
+    # written once by `_save_md5_index`, e.g. after hashing many files
+    with _md5_index.update(save=False) as index:
+        index[_index_key(file_path)] = [*_stat_key(stat), file_md5]
+
+
+def _save_md5_index() -> None:
+    _md5_index.save()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable
+
+import pandas as pd
+from lamin_utils import logger
+
+from bionty_base._settings import settings
+
+from ._io import list_s3_assets
+
+PREFETCH_COLUMNS = [
+    "entity",
+    "organism",
+    "source",
+    "version",
+    "seconds",
+    "bytes",
+    "error",
+]
+
+
+def prefetch(
+    entity: str | Iterable[str] | None = None,
+    organism: str | Iterable[str] | None = None,
+    source: str | Iterable[str] | None = None,
+    version: str | Iterable[str] | None = None,
+    *,
+    currently_used: bool = True,
+    max_workers: int = 4,
+    processes: bool = False,
+) -> pd.DataFrame:
+    """Download and build the cached tables of sources concurrently.
+
+    Populates `settings.dynamicdir` ahead of time, e.g. in container image builds,
+    so that PublicOntology objects are created without downloading or parsing.
+    Failures of single sources are logged and reported, they don't stop the others.
+
+    Args:
+        entity: Entity class names to prefetch, e.g. "Gene". All by default.
+        organism: Organisms to prefetch. All by default.
+        source: Sources to prefetch. All by default.
+        version: Versions to prefetch. All by default.
+        currently_used: Whether to prefetch only the currently used sources or
+            all available sources.
+        max_workers: Maximal number of sources fetched at the same time.
+        processes: Whether to use processes instead of threads, which speeds up
+            parsing ontology source files that are not available as parquet.
+
+    Returns:
+        A DataFrame with the seconds taken, the bytes cached and the error of each
+        prefetched source.
+
+    Examples:
+        >>> import bionty_base as bt
+        >>> bt.dev.prefetch(entity=["Gene", "CellType"], organism="human")
+    """
+    from bionty_base._source_registry import SourceRegistry
+
+    records = SourceRegistry.get().select(
+        entity=entity,
+        organism=organism,
+        source=source,
+        version=version,
+        currently_used=currently_used,
+    )
+    if len(records) == 0:
+        logger.warning("no sources to prefetch")
+        return pd.DataFrame(columns=PREFETCH_COLUMNS)
+
+    if not settings.offline_first:
+        # one listing replaces the freshness checks of the cached files
+        try:
+            list_s3_assets()
+        except Exception as e:
+            logger.warning(f"could not list bionty-assets: {e}")
+
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=max_workers) as pool:
+        rows = list(pool.map(_prefetch_source, records))
+
+    n_failed = sum(row["error"] is not None for row in rows)
+    if n_failed > 0:
+        logger.warning(f"failed to prefetch {n_failed} of {len(rows)} sources")
+    else:
+        logger.success(f"prefetched {len(rows)} sources")
+    return pd.DataFrame(rows, columns=PREFETCH_COLUMNS)
+
+
+def _prefetch_source(record: dict) -> dict:
+    """Download and build the cached files of a single source."""
+    start = time.perf_counter()
+    error = None
+    nbytes = 0
+    try:
+        ontology = _lazy_ontology(record)
+        # downloads or builds the cached table, only its index is read back
+        ontology._load_df(columns=[])
+        nbytes = _cached_bytes(ontology)
+    except Exception as e:
+        logger.warning(
+            f"could not prefetch {record['entity']} {record['organism']}"
+            f" {record['source']} {record['version']}: {e}"
+        )
+        error = f"{type(e).__name__}: {e}"
+    return {
+        **record,
+        "seconds": time.perf_counter() - start,
+        "bytes": nbytes,
+        "error": error,
+    }
+
+
+def _lazy_ontology(record: dict):
+    """A PublicOntology object of a source record without loading its table."""
+    import bionty_base
+
+    return getattr(bionty_base, record["entity"])(
+        organism=record["organism"],
+        source=record["source"],
+        version=record["version"],
+        lazy=True,
+    )
+
+
+def _cached_bytes(ontology) -> int:
+    """Bytes of the cached files of a PublicOntology object."""
+    from bionty_base._storage import ipc_path
+
+    paths = [ontology._local_parquet_path, ipc_path(ontology._local_parquet_path)]
+    if ontology._local_ontology_path is not None:
+        paths.append(ontology._local_ontology_path)
+    return sum(path.stat().st_size for path in paths if path.exists())
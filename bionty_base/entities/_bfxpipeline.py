@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 import pandas as pd
 
@@ -27,7 +27,8 @@ class BFXPipeline(PublicOntology):
     ) -> None:
         super().__init__(source=source, version=version, organism=organism, **kwargs)
 
-    def _load_df(self) -> pd.DataFrame:
+    def _load_df(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # the table is small and not stored as parquet, columns are not projected
         localpath = self._local_parquet_path.as_posix().replace(  # type:ignore
             ".parquet", ".json"
         )
@@ -52,4 +53,4 @@ class BFXPipeline(PublicOntology):
             >>> import bionty_base as bt
             >>> bt.BFXPipeline().df()
         """
-        return self._df.set_index("ontology_id")
+        return self._ensure_columns().set_index("ontology_id")
@@ -5,6 +5,7 @@ from lamin_utils import logger
 
 from bionty_base._ontology import Ontology
 from bionty_base._public_ontology import PublicOntology
+from bionty_base.dev._cache import record_access
 from bionty_base.entities._shared_docstrings import _doc_params, organism_removed
 
 
@@ -47,6 +48,7 @@ class ExperimentalFactor(PublicOntology):
             url=self._url,  # type:ignore
             md5=self._md5,  # type:ignore
         )
+        record_access(self._local_ontology_path)  # type:ignore
         onto = Ontology(
             handle=self._local_ontology_path,  # type:ignore
             prefix="http://www.ebi.ac.uk/efo/",
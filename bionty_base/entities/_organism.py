@@ -1,9 +1,12 @@
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 import pandas as pd
 
 from bionty_base._public_ontology import PublicOntology
-from bionty_base.dev._io import s3_bionty_assets
+from bionty_base._storage import write_parquet
+from bionty_base.dev._cache import _enforce_budget
+from bionty_base.dev._cas import materialize, store
+from bionty_base.dev._io import file_lock, s3_bionty_assets
 from bionty_base.entities._shared_docstrings import _doc_params, organism_removed
 
 
@@ -30,40 +33,49 @@ class Organism(PublicOntology):
     ):
         super().__init__(organism=organism, source=source, version=version, **kwargs)
 
-    def _load_df(self) -> pd.DataFrame:
+    def _load_df(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         if self.source == "ensembl":
+            # cached files are used as is and need no lock
             if not self._local_parquet_path.exists():
-                # try to download from s3
-                s3_bionty_assets(
-                    filename=self._parquet_filename,
-                    assets_base_url="s3://bionty-assets",
-                    localpath=self._local_parquet_path,
-                )
+                # one process downloads or builds the parquet file, the others wait
+                with file_lock(self._local_parquet_path):
+                    if not self._local_parquet_path.exists():
+                        materialize(self._local_parquet_path)
+                    if not self._local_parquet_path.exists():
+                        # try to download from s3
+                        s3_bionty_assets(
+                            filename=self._parquet_filename,
+                            assets_base_url="s3://bionty-assets",
+                            localpath=self._local_parquet_path,
+                        )
 
-            # try to download from original url
-            if not self._local_parquet_path.exists():
-                self._url_download(self._url, self._local_ontology_path)  # type:ignore
-                df = pd.read_csv(
-                    self._local_ontology_path,
-                    sep="\t",
-                    index_col=False,  # type:ignore
-                )
-                df.rename(
-                    columns={
-                        "#name": "name",
-                        "species": "scientific_name",
-                        "taxonomy_id": "ontology_id",
-                    },
-                    inplace=True,
-                )
-                df["name"] = df["name"].str.lower()
-                df["ontology_id"] = "NCBITaxon:" + df["ontology_id"].astype(str)
-                df.to_parquet(self._local_parquet_path)
-                return df
-            else:
-                return pd.read_parquet(self._local_parquet_path)
+                    # try to download from original url
+                    if not self._local_parquet_path.exists():
+                        self._url_download(self._url, self._local_ontology_path)  # type:ignore
+                        df = pd.read_csv(
+                            self._local_ontology_path,
+                            sep="\t",
+                            index_col=False,  # type:ignore
+                        )
+                        df.rename(
+                            columns={
+                                "#name": "name",
+                                "species": "scientific_name",
+                                "taxonomy_id": "ontology_id",
+                            },
+                            inplace=True,
+                        )
+                        df["name"] = df["name"].str.lower()
+                        df["ontology_id"] = "NCBITaxon:" + df["ontology_id"].astype(str)
+                        # read back like downloaded files, with the memory_map and
+                        # compact_dtypes settings
+                        write_parquet(df, self._local_parquet_path)
+                    store(self._local_parquet_path)
+            df = self._read_local_parquet(columns=columns)
+            _enforce_budget(keep=self._local_parquet_path)
+            return df
         else:
-            return super()._load_df()
+            return super()._load_df(columns=columns)
 
     def df(self) -> pd.DataFrame:
         """Pandas DataFrame of the ontology.
@@ -75,4 +87,4 @@ class Organism(PublicOntology):
             >>> import bionty_base as bt
             >>> bt.Organism().df()
         """
-        return self._df.set_index("name")
+        return self._ensure_columns().set_index("name")
@@ -28,6 +28,9 @@ organism: `name` of `Organism` entity.
                   Get all available databases with `.display_available_sources()`.
         version: The version of the ontology. Typically a date or an actual version.
                   Get available versions with `.display_available_sources()`.
+        columns: Columns of the ontology table to load, e.g. `["symbol"]`.
+                  Other columns are loaded on first access. Defaults to all columns.
+        lazy: Whether to defer loading the ontology table until it is first used.
 """
 organism_removed_tmp = "\n".join(doc_entites.split("\n")[1:]).split("\n")
 organism_removed_tmp[0] = remove_prefix(organism_removed_tmp[0], "        ")
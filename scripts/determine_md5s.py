@@ -1,34 +1,61 @@
+from __future__ import annotations
+
+import asyncio
 from pathlib import Path
-from tempfile import NamedTemporaryFile, gettempdir
+from tempfile import TemporaryDirectory
 
+from bionty_base.dev._async_io import (
+    async_s3_bionty_assets,
+    async_url_download,
+    gather_downloads,
+)
 from bionty_base.dev._handle_sources import parse_sources_yaml
-from bionty_base.dev._io import s3_bionty_assets, url_download
 from bionty_base.dev._md5 import calculate_md5
 from rich import print
 
-df = parse_sources_yaml()
-
-for _index, row in df.iterrows():
-    url = row["url"]
-    md5 = row["md5"]
-    if not md5:
-        if not url.startswith("s3"):
-            with NamedTemporaryFile() as temp_file:
-                tmp_file_path = temp_file.name
-                url_download(url, tmp_file_path)
-                md5 = calculate_md5(tmp_file_path)
-        elif url.startswith("s3"):
-            file_name = url.removeprefix("s3://bionty-assets/")
-            local_path = Path(f"{gettempdir()}/{file_name}")
-            s3_bionty_assets(
-                file_name, localpath=local_path, assets_base_url="s3://bionty-assets"
-            )
-            try:
-                md5 = calculate_md5(local_path)
-            except FileNotFoundError:
+
+async def determine_md5(url: str, tmp_dir: Path) -> str | None:
+    if not url.startswith("s3"):
+        _, md5 = await async_url_download(
+            url, tmp_dir / url.rstrip("/").split("/")[-1], return_md5=True
+        )
+    elif url.startswith("s3"):
+        file_name = url[len("s3://bionty-assets/") :]
+        local_path = tmp_dir / file_name.split("/")[-1]
+        _, md5 = await async_s3_bionty_assets(
+            file_name,
+            localpath=local_path,
+            assets_base_url="s3://bionty-assets",
+            return_md5=True,
+        )
+        if md5 is None:
+            if not local_path.exists():
                 print(f"[bold red]URL {url} could not be downloaded. Is it on S3?")
-                continue
-        else:
-            raise ValueError(f"URL type for: {url} not recognized")
+                return None
+            md5 = calculate_md5(local_path)
+    else:
+        raise ValueError(f"URL type for: {url} not recognized")
+    return md5
+
+
+async def main() -> None:
+    df = parse_sources_yaml()
+    urls = list(dict.fromkeys(df.loc[~df["md5"].astype(bool), "url"]))
+    with TemporaryDirectory() as tmp_dir:
+        # each download gets its own directory as file names may repeat across urls
+        tmp_dirs = [Path(tmp_dir) / str(i) for i in range(len(urls))]
+        for path in tmp_dirs:
+            path.mkdir()
+        md5s = await gather_downloads(
+            *(determine_md5(url, path) for url, path in zip(urls, tmp_dirs)),
+            return_exceptions=True,
+        )
+    for url, md5 in zip(urls, md5s):
+        if isinstance(md5, Exception):
+            print(f"[bold red]URL {url} could not be downloaded: {md5}")
+        elif md5 is not None:
+            print(f"[bold blue]URL: [green]{url} [blue]has md5: [green]{md5}")
+
 
-        print(f"[bold blue]URL: [green]{url} [blue]has md5: [green]{md5}")
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import bionty_base as bt
+import pandas as pd
+import pytest
+from bionty_base._public_ontology import encode_filenames
+from bionty_base._settings import settings
+from bionty_base.dev._md5 import calculate_md5, record_md5
+
+
+@pytest.fixture(autouse=True)
+def versionsdir(tmp_path_factory, monkeypatch):
+    """A temporary versionsdir, tests don't write to the sources and indexes in ~/.lamin."""
+    monkeypatch.setattr(settings, "versionsdir", tmp_path_factory.mktemp("versions"))
+    yield settings.versionsdir
+
+
+@pytest.fixture
+def local_celltype(tmp_path):
+    """A cached CellType table in a temporary dynamicdir, loaded without network."""
+    dynamicdir, offline_first = settings.dynamicdir, settings.offline_first
+    settings.dynamicdir = tmp_path
+    settings.offline_first = True
+
+    record = bt.SourceRegistry.get().match("CellType", currently_used=True)
+    parquet_filename, _ = encode_filenames(
+        organism=record["organism"],
+        source=record["source"],
+        version=record["version"],
+        entity="CellType",
+    )
+    df = pd.DataFrame(
+        {
+            "ontology_id": ["CL:0000001", "CL:0000002", "CL:0000003"],
+            "name": ["T cell", "B cell", "mast cell"],
+            "definition": ["A T cell.", "A B cell.", "A mast cell."],
+            "synonyms": ["T-cell|T lymphocyte", None, "mastocyte"],
+            "parents": [["CL:0000000"], ["CL:0000000"], []],
+        }
+    ).set_index("ontology_id")
+    df.to_parquet(tmp_path / parquet_filename)
+    # as if downloaded, with a verified md5 sum
+    record_md5(tmp_path / parquet_filename, calculate_md5(tmp_path / parquet_filename))
+    yield df.reset_index()
+
+    settings.dynamicdir, settings.offline_first = dynamicdir, offline_first
+
+
+@pytest.fixture
+def local_celltype_previous(local_celltype):
+    """A previous version of the cached CellType table, with one changed entry."""
+    current = bt.SourceRegistry.get().match("CellType", currently_used=True)
+    record = next(
+        r
+        for r in bt.SourceRegistry.get().available("CellType")
+        if r["source"] == current["source"] and r["version"] != current["version"]
+    )
+    parquet_filename, _ = encode_filenames(
+        organism=record["organism"],
+        source=record["source"],
+        version=record["version"],
+        entity="CellType",
+    )
+    df = local_celltype.iloc[:2].copy()
+    df.loc[1, "definition"] = "A B lymphocyte."
+    df.set_index("ontology_id").to_parquet(settings.dynamicdir / parquet_filename)
+    path = settings.dynamicdir / parquet_filename
+    record_md5(path, calculate_md5(path))
+    yield record["version"]
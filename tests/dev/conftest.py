@@ -0,0 +1,163 @@
+import io
+import re
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Serves files of a directory, with support for single byte ranges.
+
+    It also stands in for an S3-compatible endpoint with path-style addressing.
+
+    Files below `/norange/` are served without range support. If `fail_after` is
+    set, the next response is cut after that many bytes of its body. Conditional
+    requests are answered with 304 if the ETag or the Last-Modified date match.
+    """
+
+    requests: list = []
+    fail_after = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        self.requests.append((self.command, self.path, self.headers.get("Range")))
+        self.close_connection = True
+        url = urlsplit(self.path)
+        if "list-type=2" in url.query:
+            return self._list_objects(url)
+        supports_ranges = not self.path.startswith("/norange/")
+        if not supports_ranges:
+            self.path = self.path[len("/norange") :]
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404, "File not found")
+            return None
+        stat = path.stat()
+        size = stat.st_size
+        f = path.open("rb")
+        last_modified = self.date_time_string(int(stat.st_mtime))
+        etag = f'"{stat.st_mtime_ns}-{size}"'
+        if self.headers.get("If-Match", etag) != etag:
+            f.close()
+            self.send_error(412, "Precondition Failed")
+            return None
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match == etag or (
+            if_none_match is None
+            and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            f.close()
+            self.send_response(304)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if supports_ranges and match is not None and if_range in {None, last_modified}:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or size - 1), size - 1)
+            if start >= size:
+                f.close()
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return None
+            f.seek(start)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            length = end - start + 1
+        else:
+            self.send_response(200)
+            length = size
+        if supports_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        if RangeRequestHandler.fail_after is not None:
+            length, RangeRequestHandler.fail_after = (
+                RangeRequestHandler.fail_after,
+                None,
+            )
+        return _LimitedReader(f, length)
+
+    def _list_objects(self, url):
+        """Response of the S3 ListObjectsV2 API for a directory, in a single page."""
+        directory = Path(self.translate_path(url.path))
+        prefix = parse_qs(url.query).get("prefix", [""])[0]
+        contents = "".join(
+            f"<Contents><Key>{path.name}</Key>"
+            f"<LastModified>{datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat()}</LastModified>"
+            f'<ETag>"{path.stat().st_mtime_ns}-{path.stat().st_size}"</ETag>'
+            f"<Size>{path.stat().st_size}</Size></Contents>"
+            for path in sorted(directory.iterdir())
+            if path.is_file() and path.name.startswith(prefix)
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{directory.name}</Name><Prefix>{prefix}</Prefix>"
+            f"<IsTruncated>false</IsTruncated>{contents}</ListBucketResult>"
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def copyfile(self, source, outputfile):
+        while chunk := source.read(64 * 1024):
+            outputfile.write(chunk)
+
+
+class _LimitedReader:
+    def __init__(self, f, length):
+        self._f = f
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._f.close()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """A local HTTP server of a temporary directory.
+
+    Yields the base url, the served directory, the log of received requests and a
+    function that cuts the body of the next response after a number of bytes.
+    """
+    root = tmp_path / "http"
+    root.mkdir()
+    RangeRequestHandler.requests = []
+    RangeRequestHandler.fail_after = None
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(RangeRequestHandler, directory=str(root))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield SimpleNamespace(
+        url=f"http://127.0.0.1:{server.server_address[1]}",
+        root=root,
+        requests=RangeRequestHandler.requests,
+        cut_next_response=partial(setattr, RangeRequestHandler, "fail_after"),
+    )
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from bionty_base.dev import _async_io
+from bionty_base.dev._async_io import (
+    async_s3_bionty_assets,
+    async_url_download,
+    gather_downloads,
+)
+
+
+def test_gather_downloads(http_server, tmp_path):
+    bucket_path = http_server.root / "bionty-assets"
+    bucket_path.mkdir()
+    (bucket_path / "bfxpipelines.json").write_text("{}")
+    for i in range(5):
+        (http_server.root / f"{i}.obo").write_text(f"format-version: 1.{i}")
+
+    results = asyncio.run(
+        gather_downloads(
+            *(
+                async_url_download(f"{http_server.url}/{i}.obo", tmp_path / f"{i}.obo")
+                for i in range(5)
+            ),
+            async_s3_bionty_assets(
+                "bfxpipelines.json",
+                localpath=tmp_path / "bfxpipelines.json",
+                assets_base_url=f"{http_server.url}/bionty-assets",
+            ),
+            max_concurrency=2,
+        )
+    )
+    assert results == [tmp_path / f"{i}.obo" for i in range(5)] + [
+        tmp_path / "bfxpipelines.json"
+    ]
+    assert (tmp_path / "3.obo").read_text() == "format-version: 1.3"
+    assert (tmp_path / "bfxpipelines.json").read_text() == "{}"
+
+
+def test_gather_downloads_limits(monkeypatch):
+    running: dict = {}
+    peaks: dict = {}
+    lock = threading.Lock()
+
+    def url_download(url, localpath=None, **kwargs):
+        host = url.split("/")[2]
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            running["total"] = running.get("total", 0) + 1
+            for key in (host, "total"):
+                peaks[key] = max(peaks.get(key, 0), running[key])
+        time.sleep(0.05)
+        with lock:
+            running[host] -= 1
+            running["total"] -= 1
+        return localpath
+
+    monkeypatch.setattr(_async_io, "url_download", url_download)
+    urls = [f"https://{host}.org/{i}.obo" for host in "abc" for i in range(4)]
+    asyncio.run(
+        gather_downloads(
+            *(async_url_download(url) for url in urls),
+            max_concurrency=4,
+            max_per_host=2,
+        )
+    )
+    assert peaks["total"] == 4
+    assert all(peaks[f"{host}.org"] == 2 for host in "abc")
+
+
+def test_gather_downloads_exceptions(http_server, tmp_path):
+    results = asyncio.run(
+        gather_downloads(
+            async_url_download(f"{http_server.url}/missing.obo", tmp_path / "a.obo"),
+            return_exceptions=True,
+        )
+    )
+    assert isinstance(results[0], Exception)
+    with pytest.raises(ValueError):
+        asyncio.run(gather_downloads(max_per_host=0))
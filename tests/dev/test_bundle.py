@@ -0,0 +1,52 @@
+import io
+import tarfile
+
+import bionty_base as bt
+import pytest
+from bionty_base._settings import settings
+
+
+def test_export_and_import_bundle(local_celltype, tmp_path_factory):
+    celltype = bt.CellType()
+    bundle = tmp_path_factory.mktemp("bundle") / "celltype.tar.gz"
+    assert bt.dev.export_bundle(bundle, entity="CellType") == bundle
+    with tarfile.open(bundle) as tar:
+        assert tar.getnames() == ["manifest.json", celltype._parquet_filename]
+
+    # import into an empty cache
+    settings.dynamicdir = tmp_path_factory.mktemp("dynamic")
+    imported = bt.dev.import_bundle(bundle)
+    assert imported == [settings.dynamicdir / celltype._parquet_filename]
+
+    n_checks = bt.dev.io_stats()["remote_checks"]
+    assert bt.CellType().df().shape[0] == local_celltype.shape[0]
+    assert bt.dev.io_stats()["remote_checks"] == n_checks
+
+
+def test_import_bundle_verifies_md5(local_celltype, tmp_path_factory):
+    celltype = bt.CellType()
+    bundle = tmp_path_factory.mktemp("bundle") / "celltype.tar.gz"
+    bt.dev.export_bundle(bundle, entity="CellType")
+
+    # replace the parquet file with different content
+    corrupted = bundle.with_name("corrupted.tar.gz")
+    with tarfile.open(bundle) as src, tarfile.open(corrupted, "w:gz") as dst:
+        for member in src:
+            data = src.extractfile(member).read()
+            if member.name == celltype._parquet_filename:
+                data = data[:-1] + b"x"
+            dst.addfile(member, io.BytesIO(data))
+
+    settings.dynamicdir = tmp_path_factory.mktemp("dynamic")
+    with pytest.raises(ValueError, match="md5 sum"):
+        bt.dev.import_bundle(corrupted)
+    assert list(settings.dynamicdir.iterdir()) == []
+
+
+def test_import_bundle_without_manifest(tmp_path):
+    path = tmp_path / "not_a_bundle.tar.gz"
+    with tarfile.open(path, "w:gz") as tar:
+        info = tarfile.TarInfo("file.parquet")
+        tar.addfile(info, io.BytesIO(b""))
+    with pytest.raises(ValueError, match="no manifest"):
+        bt.dev.import_bundle(path)
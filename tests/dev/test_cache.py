@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from bionty_base._public_ontology import encode_filenames
+from bionty_base._settings import Settings, settings
+from bionty_base._source_registry import SourceRegistry
+from bionty_base.dev import _cache
+from bionty_base.dev._cache import cache_info, evict_cache, record_access
+from bionty_base.dev._io import file_lock
+
+
+@pytest.fixture
+def dynamicdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        Settings, "access_index", property(lambda self: tmp_path / ".access.json")
+    )
+    dynamicdir = settings.dynamicdir
+    settings.dynamicdir = tmp_path / "dynamic"
+    settings.dynamicdir.mkdir()
+    yield settings.dynamicdir
+    settings.dynamicdir = dynamicdir
+    settings.dynamicdir_max_bytes = None
+
+
+def _cache_source(entity, organism, source, version, nbytes=1000):
+    parquet_filename, ontology_filename = encode_filenames(
+        organism=organism, source=source, version=version, entity=entity
+    )
+    paths = [
+        settings.dynamicdir / parquet_filename,
+        settings.dynamicdir / f"{ontology_filename}.gz",
+    ]
+    for path in paths:
+        path.write_bytes(b"0" * nbytes)
+    return paths
+
+
+def test_cache_info(dynamicdir):
+    current = SourceRegistry.get().current("CellType")[0]
+    _cache_source(**current)
+    _cache_source("CellType", "all", "cl", "2020-01-01", nbytes=500)
+    (dynamicdir / "df_all__cl__2020-01-01__CellType.parquet.lock").touch()
+    (dynamicdir / "ontology_all__cl__2021-01-01__CellType.part").write_bytes(b"0")
+
+    info = cache_info().set_index("version")
+    assert info.loc[current["version"], ["bytes", "files", "pinned"]].tolist() == [
+        2000,
+        2,
+        True,
+    ]
+    assert info.loc["2020-01-01", ["bytes", "files", "pinned"]].tolist() == [
+        1000,
+        2,
+        False,
+    ]
+    assert len(info) == 2
+
+
+def test_evict_cache(dynamicdir):
+    current = SourceRegistry.get().current("CellType")[0]
+    pinned = _cache_source(**current)
+    old = _cache_source("CellType", "all", "cl", "2020-01-01")
+    used = _cache_source("CellType", "all", "cl", "2021-01-01")
+    kept = _cache_source("CellType", "all", "cl", "2022-01-01")
+    record_access(old[0])
+    time.sleep(0.01)
+    record_access(used[0])
+
+    assert evict_cache() == []
+    # the least recently used source is deleted first, files without recorded
+    # accesses count as accessed when they were cached
+    assert sorted(evict_cache(max_bytes=6000, keep=[kept[1]])) == sorted(old)
+    assert sorted(evict_cache(max_bytes=0, keep=[kept[1]])) == sorted(used)
+    assert all(path.exists() for path in pinned + kept)
+    assert str(old[0]) not in _cache._access_index.copy()
+
+
+def test_evict_cache_skips_locked_files(dynamicdir):
+    old = _cache_source("CellType", "all", "cl", "2020-01-01")
+    locked, released = threading.Event(), threading.Event()
+
+    def build():
+        # another thread is building the parquet file
+        with file_lock(old[0]):
+            locked.set()
+            released.wait()
+
+    with ThreadPoolExecutor() as pool:
+        pool.submit(build)
+        locked.wait()
+        assert evict_cache(max_bytes=0) == [old[1]]
+        released.set()
+    assert old[0].exists()
@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+import pytest
+from bionty_base._settings import settings
+from bionty_base.dev import _cas
+from bionty_base.dev._cas import materialize, store
+
+CONTENT = b"format-version: 1.2"
+MD5 = hashlib.md5(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def cas_dir(tmp_path):
+    settings.cas_dir = tmp_path / "cas"
+    yield settings.cas_dir
+    settings.cas_dir = None
+
+
+def test_store_and_materialize(cas_dir, tmp_path):
+    localpath = tmp_path / "alice" / "ontology_all__pw__1__Pathway"
+    localpath.parent.mkdir()
+    localpath.write_bytes(CONTENT)
+    object_path = store(localpath)
+    assert object_path == cas_dir / MD5[:2] / MD5
+    assert object_path.read_bytes() == CONTENT
+    assert localpath.samefile(object_path)
+    assert object_path.stat().st_mode & 0o777 == 0o444
+
+    # another user's cache is linked to the stored file by md5 or by filename
+    other_path = tmp_path / "bob" / localpath.name
+    assert materialize(other_path, md5=MD5)
+    assert other_path.samefile(object_path)
+    other_path.unlink()
+    assert materialize(other_path)
+    assert other_path.stat().st_ino == object_path.stat().st_ino
+
+    assert not materialize(tmp_path / "bob" / "missing")
+    assert not materialize(tmp_path / "bob" / "missing", md5="0" * 32)
+
+
+def test_materialize_symlink_and_copy(cas_dir, tmp_path, monkeypatch):
+    localpath = tmp_path / "ontology_all__pw__1__Pathway"
+    localpath.write_bytes(CONTENT)
+    object_path = store(localpath, md5=MD5)
+
+    def cross_device_link(src, dst):
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(_cas.os, "link", cross_device_link)
+    symlinked = tmp_path / "symlinked" / localpath.name
+    assert materialize(symlinked)
+    assert symlinked.is_symlink() and symlinked.samefile(object_path)
+
+    monkeypatch.setattr(
+        type(symlinked), "symlink_to", lambda self, target: cross_device_link(0, 0)
+    )
+    copied = tmp_path / "copied" / localpath.name
+    assert materialize(copied)
+    assert not copied.is_symlink() and not copied.samefile(object_path)
+    assert copied.read_bytes() == CONTENT
+    # copies are kept as they are
+    store(copied)
+    assert not copied.samefile(object_path)
+
+
+def test_store_disabled(tmp_path):
+    localpath = tmp_path / "ontology_all__pw__1__Pathway"
+    localpath.write_bytes(CONTENT)
+    assert settings.cas_dir is None
+    assert store(localpath) is None
+    assert not materialize(tmp_path / "other")
+
+
+def test_store_not_writable(cas_dir, tmp_path, monkeypatch):
+    localpath = tmp_path / "ontology_all__pw__1__Pathway"
+    localpath.write_bytes(CONTENT)
+    store(localpath, md5=MD5)
+
+    def permission_denied(*args, **kwargs):
+        raise PermissionError("Permission denied")
+
+    # e.g. a store shared with other users, the private file is used instead
+    monkeypatch.setattr(_cas, "_link", permission_denied)
+    other_path = tmp_path / "other" / localpath.name
+    assert not materialize(other_path, md5=MD5)
+    assert not other_path.exists()
+
+    monkeypatch.setattr(_cas.os, "link", permission_denied)
+    monkeypatch.setattr(_cas.shutil, "copy2", permission_denied)
+    new_path = tmp_path / "ontology_all__pw__2__Pathway"
+    new_path.write_bytes(b"format-version: 1.4")
+    assert store(new_path) is None
+    assert new_path.read_bytes() == b"format-version: 1.4"
+    new_md5 = hashlib.md5(b"format-version: 1.4").hexdigest()
+    assert list(cas_dir.glob(f"{new_md5[:2]}/*")) == []
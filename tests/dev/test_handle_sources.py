@@ -224,3 +224,21 @@ def test_reset_sources(monkeypatch):
         settings.current_sources.as_posix(), settings.lamindb_sources.as_posix()
     )
     reset_sources()
+
+
+def test_parse_sources_yaml_compiled_index(versions_yaml_replica):
+    from bionty_base.dev import _handle_sources
+
+    parsed_df = parse_sources_yaml(versions_yaml_replica)
+    key = Path(versions_yaml_replica).resolve().as_posix()
+    assert key in _handle_sources._compiled_sources
+
+    # reused until the file changes
+    assert parse_sources_yaml(versions_yaml_replica).equals(parsed_df)
+    versions = load_yaml(versions_yaml_replica)
+    versions["CellType"]["cl"]["all"].popitem()
+    write_yaml(versions, versions_yaml_replica)
+    assert parse_sources_yaml(versions_yaml_replica).shape == (5, 8)
+
+    parse_sources_yaml(settings.local_sources)
+    assert (settings.versionsdir / ".sources_local.pkl").exists()
@@ -1,7 +1,32 @@
+import bz2
+import gzip
+import hashlib
+import json
+import lzma
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import bionty_base as bt
 import pytest
-from bionty_base.dev._io import url_download
+import requests
+from bionty_base._settings import Settings, settings
+from bionty_base.dev import _io
+from bionty_base.dev._io import (
+    _get_s3_client,
+    _record_freshness,
+    _split_assets_base_url,
+    _trust_cached_file,
+    compression_suffix,
+    file_lock,
+    io_stats,
+    list_s3_assets,
+    open_decompressed,
+    s3_bionty_assets,
+    url_download,
+)
+from bionty_base.dev._md5 import record_md5
+from botocore.exceptions import ResponseStreamingError
 
 
 @pytest.fixture
@@ -20,3 +45,445 @@ def test_url_download(local):
 
     downloaded_path = Path(url_download(url=url, localpath=localpath))
     assert downloaded_path.exists()
+
+
+@pytest.fixture
+def cached_file(tmp_path):
+    localpath = tmp_path / "df_all__test__0.1__Test.parquet"
+    localpath.write_text("cached")
+    record_md5(localpath, hashlib.md5(b"cached").hexdigest())
+    yield localpath
+    settings.offline_first = False
+    settings.freshness_ttl = None
+
+
+def test_s3_bionty_assets_offline_first(cached_file):
+    settings.offline_first = True
+    avoided = io_stats()["remote_checks_avoided"]
+    assert s3_bionty_assets(cached_file.name, localpath=cached_file) == cached_file
+    assert io_stats()["remote_checks_avoided"] == avoided + 1
+    assert cached_file.read_text() == "cached"
+
+    # files that changed since their md5 sum was verified are not trusted
+    cached_file.write_text("cache")
+    assert not _trust_cached_file(cached_file)
+
+
+def test_s3_bionty_assets_freshness_ttl(cached_file):
+    settings.freshness_ttl = 3600
+    assert not _trust_cached_file(cached_file)
+    _record_freshness(cached_file)
+    assert _trust_cached_file(cached_file)
+    settings.freshness_ttl = 0
+    assert not _trust_cached_file(cached_file)
+
+
+def test_record_freshness_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        Settings, "freshness_index", property(lambda self: tmp_path / ".fresh.json")
+    )
+    paths = [tmp_path / f"{i}.parquet" for i in range(400)]
+    for path in paths:
+        path.touch()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_record_freshness, paths))
+    with open(tmp_path / ".fresh.json") as f:
+        assert len(json.load(f)) == 400
+
+    # entries of deleted files are dropped
+    paths[0].unlink()
+    _record_freshness(paths[1])
+    with open(tmp_path / ".fresh.json") as f:
+        assert len(json.load(f)) == 399
+
+
+@pytest.fixture
+def large_file(http_server, monkeypatch):
+    # download files of a few MB in parallel chunks of 1 MiB
+    monkeypatch.setattr(_io, "RANGE_CHUNK_SIZE", 1024**2)
+    content = os.urandom(10 * 1024**2 + 123)
+    (http_server.root / "large.obo").write_bytes(content)
+    return content
+
+
+def test_url_download_ranges(http_server, large_file, tmp_path):
+    localpath = tmp_path / "large.obo"
+    url_download(f"{http_server.url}/large.obo", localpath)
+    assert localpath.read_bytes() == large_file
+    ranges = [r for _, _, r in http_server.requests]
+    assert len(ranges) == 11
+    assert ranges[0] == f"bytes=0-{1024**2 - 1}"
+    assert f"bytes={10 * 1024**2}-{len(large_file) - 1}" in ranges
+
+
+def test_url_download_without_ranges(http_server, large_file, tmp_path):
+    localpath = tmp_path / "large.obo"
+    url_download(f"{http_server.url}/norange/large.obo", localpath)
+    assert localpath.read_bytes() == large_file
+    # the server ignored the range of the first request
+    assert len(http_server.requests) == 1
+
+
+def test_file_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "lockdir", property(lambda self: tmp_path / "locks"))
+    (tmp_path / "a").mkdir()
+    with file_lock(tmp_path / "a" / "df.parquet"):
+        pass
+    # no lock file is left next to the cached file
+    assert list((tmp_path / "a").iterdir()) == []
+    # files of the same name in other directories have their own lock
+    lock = file_lock(tmp_path / "a" / "df.parquet")
+    assert lock is file_lock(tmp_path / "a" / "df.parquet")
+    assert lock.lock_file != file_lock(tmp_path / "b" / "df.parquet").lock_file
+
+
+def test_url_download_small_file(http_server, tmp_path):
+    (http_server.root / "small.obo").write_text("format-version: 1.2")
+    localpath = tmp_path / "small.obo"
+    url_download(f"{http_server.url}/small.obo", localpath)
+    assert localpath.read_text() == "format-version: 1.2"
+    assert len(http_server.requests) == 1
+
+
+def test_url_download_not_found(http_server, tmp_path):
+    with pytest.raises(requests.exceptions.HTTPError):
+        url_download(f"{http_server.url}/missing.obo", tmp_path / "missing.obo")
+
+
+def test_url_download_resumes(http_server, large_file, tmp_path):
+    localpath = tmp_path / "large.obo"
+    # the server supports ranges, but cuts the first response
+    url = f"{http_server.url}/large.obo"
+    http_server.cut_next_response(300_000)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        url_download(url, localpath, block_size=100_000, max_workers=1, retries=0)
+    assert not localpath.exists()
+    assert (tmp_path / "large.obo.part").stat().st_size == 300_000
+
+    url_download(url, localpath, max_workers=1, md5=hashlib.md5(large_file).hexdigest())
+    assert localpath.read_bytes() == large_file
+    assert http_server.requests[-1][2] == "bytes=300000-"
+    assert not (tmp_path / "large.obo.part").exists()
+    assert not (tmp_path / "large.obo.part.json").exists()
+
+
+def test_url_download_retries(http_server, large_file, tmp_path):
+    localpath = tmp_path / "large.obo"
+    http_server.cut_next_response(300_000)
+    url_download(f"{http_server.url}/large.obo", localpath, block_size=100_000)
+    assert localpath.read_bytes() == large_file
+    assert http_server.requests[1][2] == f"bytes=300000-{300_000 + 1024**2 - 1}"
+
+
+def test_url_download_unreachable(tmp_path, monkeypatch):
+    attempts = []
+    download_part = _io._download_part
+
+    def _download_part(*args, **kwargs):
+        attempts.append(args[0])
+        return download_part(*args, **kwargs)
+
+    monkeypatch.setattr(_io, "_download_part", _download_part)
+    # nothing listens on port 9 (discard), the connection is refused
+    with pytest.raises(requests.exceptions.ConnectionError):
+        url_download("http://127.0.0.1:9/large.obo", tmp_path / "large.obo")
+    # without any bytes received, the download is not retried
+    assert len(attempts) == 1
+
+
+def test_url_download_restarts_changed_file(http_server, large_file, tmp_path):
+    localpath = tmp_path / "large.obo"
+    url = f"{http_server.url}/large.obo"
+    http_server.cut_next_response(300_000)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        url_download(url, localpath, retries=0)
+
+    # the remote file changes before the download is resumed
+    changed = large_file[::-1]
+    remote_path = http_server.root / "large.obo"
+    remote_path.write_bytes(changed)
+    os.utime(remote_path, times=(0, 0))
+    url_download(url, localpath)
+    assert localpath.read_bytes() == changed
+
+
+def test_url_download_md5_mismatch(http_server, tmp_path):
+    (http_server.root / "small.obo").write_text("format-version: 1.2")
+    localpath = tmp_path / "small.obo"
+    with pytest.raises(ValueError, match="did not match"):
+        url_download(f"{http_server.url}/small.obo", localpath, md5="0" * 32)
+    assert not localpath.exists()
+    assert not (tmp_path / "small.obo.part").exists()
+
+
+@pytest.fixture
+def local_bucket(http_server):
+    """A bucket of the local HTTP server as an S3-compatible endpoint."""
+    (http_server.root / "bionty-assets").mkdir()
+    return http_server.root / "bionty-assets", f"{http_server.url}/bionty-assets"
+
+
+def test_s3_bionty_assets_local_endpoint(local_bucket, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    (bucket_path / "bfxpipelines.json").write_text("{}")
+    localpath = tmp_path / "bfxpipelines.json"
+
+    assert (
+        s3_bionty_assets(
+            "bfxpipelines.json", localpath=localpath, assets_base_url=assets_base_url
+        )
+        == localpath
+    )
+    assert localpath.read_text() == "{}"
+    assert localpath.stat().st_mtime == int(
+        (bucket_path / "bfxpipelines.json").stat().st_mtime
+    )
+    # a file that does not exist on S3 is not synchronized
+    missing = s3_bionty_assets(
+        "missing.json", localpath=tmp_path, assets_base_url=assets_base_url
+    )
+    assert missing == tmp_path / "missing.json"
+    assert not missing.exists()
+
+
+def test_s3_bionty_assets_corrupted_cache(local_bucket, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    (bucket_path / "bfxpipelines.json").write_text('{"a": 1}')
+    localpath = tmp_path / "bfxpipelines.json"
+    s3_bionty_assets("bfxpipelines.json", localpath, assets_base_url=assets_base_url)
+
+    # a truncated file is downloaded again, even though it is not older than S3
+    mtime = localpath.stat().st_mtime
+    localpath.write_text('{"a"')
+    os.utime(localpath, times=(mtime, mtime))
+    s3_bionty_assets("bfxpipelines.json", localpath, assets_base_url=assets_base_url)
+    assert localpath.read_text() == '{"a": 1}'
+
+
+def test_s3_bionty_assets_resumes(local_bucket, http_server, large_file, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    (http_server.root / "large.obo").rename(bucket_path / "large.obo")
+    localpath = tmp_path / "large.obo"
+    http_server.cut_next_response(3 * 1024**2)
+    with pytest.raises(ResponseStreamingError):
+        s3_bionty_assets("large.obo", localpath, assets_base_url=assets_base_url)
+    assert not localpath.exists()
+    assert (tmp_path / "large.obo.part").stat().st_size > 0
+
+    s3_bionty_assets(
+        "large.obo",
+        localpath,
+        assets_base_url=assets_base_url,
+        md5=hashlib.md5(large_file).hexdigest(),
+    )
+    assert localpath.read_bytes() == large_file
+    assert http_server.requests[-1][2].startswith("bytes=")
+    assert http_server.requests[-1][2] != "bytes=0-"
+
+
+def test_s3_client_is_shared(local_bucket):
+    endpoint_url, bucket = _split_assets_base_url(local_bucket[1])
+    assert bucket == "bionty-assets"
+    assert _get_s3_client(endpoint_url) is _get_s3_client(endpoint_url)
+    assert _split_assets_base_url("s3://bionty-assets") == (None, "bionty-assets")
+    with pytest.raises(ValueError):
+        _split_assets_base_url("bionty-assets")
+
+
+def test_s3_bionty_assets_head_check(local_bucket, http_server, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    (bucket_path / "bfxpipelines.json").write_text("{}")
+    localpath = tmp_path / "bfxpipelines.json"
+    s3_bionty_assets(
+        "bfxpipelines.json", localpath=localpath, assets_base_url=assets_base_url
+    )
+    assert [command for command, _, _ in http_server.requests] == ["GET"]
+
+    # the cached file is up to date, only its metadata is requested
+    stats = io_stats()
+    s3_bionty_assets(
+        "bfxpipelines.json", localpath=localpath, assets_base_url=assets_base_url
+    )
+    assert [command for command, _, _ in http_server.requests] == ["GET", "HEAD"]
+    assert io_stats()["bytes_avoided"] == stats["bytes_avoided"] + 2
+    assert io_stats()["downloads"] == stats["downloads"]
+
+    # a newer version on S3 is downloaded
+    (bucket_path / "bfxpipelines.json").write_text('{"a": 1}')
+    os.utime(bucket_path / "bfxpipelines.json", times=(2e9, 2e9))
+    s3_bionty_assets(
+        "bfxpipelines.json", localpath=localpath, assets_base_url=assets_base_url
+    )
+    assert localpath.read_text() == '{"a": 1}'
+    assert io_stats()["downloads"] == stats["downloads"] + 1
+    assert io_stats()["bytes_downloaded"] == stats["bytes_downloaded"] + 8
+
+
+def test_s3_bionty_assets_listing(local_bucket, http_server, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    for name in ["a.parquet", "b.parquet"]:
+        (bucket_path / name).write_text(name)
+        s3_bionty_assets(name, localpath=tmp_path, assets_base_url=assets_base_url)
+
+    objects = list_s3_assets(assets_base_url)
+    assert set(objects) == {"a.parquet", "b.parquet"}
+    assert objects["a.parquet"]["ContentLength"] == len("a.parquet")
+    n_requests = len(http_server.requests)
+    stats = io_stats()
+    for name in ["a.parquet", "b.parquet", "missing.parquet"]:
+        s3_bionty_assets(name, localpath=tmp_path, assets_base_url=assets_base_url)
+    # freshness checks and missing files are answered by the listing
+    assert len(http_server.requests) == n_requests
+    assert io_stats()["remote_checks_avoided"] == stats["remote_checks_avoided"] + 2
+    assert not (tmp_path / "missing.parquet").exists()
+
+
+def test_s3_bionty_assets_downloads_once(local_bucket, http_server, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    content = os.urandom(3 * 1024**2)
+    (bucket_path / "df_all__cl__2024-02-13__CellType.parquet").write_bytes(content)
+    localpath = tmp_path / "df_all__cl__2024-02-13__CellType.parquet"
+
+    def sync(_):
+        return s3_bionty_assets(
+            localpath.name, localpath=localpath, assets_base_url=assets_base_url
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(sync, range(4))) == [localpath] * 4
+    assert localpath.read_bytes() == content
+    # one worker downloaded the file, the others only checked it after waiting
+    commands = [command for command, _, _ in http_server.requests]
+    assert commands.count("GET") == 1
+    assert commands.count("HEAD") == 3
+    assert not (tmp_path / f"{localpath.name}.part").exists()
+
+
+def test_url_download_returns_md5(http_server, large_file, tmp_path):
+    localpath = tmp_path / "large.obo"
+    http_server.cut_next_response(300_000)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        url_download(
+            f"{http_server.url}/large.obo",
+            localpath,
+            block_size=100_000,
+            max_workers=1,
+            retries=0,
+        )
+    # the bytes of the interrupted download are part of the md5 sum
+    assert url_download(f"{http_server.url}/large.obo", localpath, return_md5=True) == (
+        localpath,
+        hashlib.md5(large_file).hexdigest(),
+    )
+
+
+def test_s3_bionty_assets_returns_md5(local_bucket, tmp_path):
+    bucket_path, assets_base_url = local_bucket
+    (bucket_path / "bfxpipelines.json").write_text("{}")
+    localpath = tmp_path / "bfxpipelines.json"
+    kwargs = {"localpath": localpath, "assets_base_url": assets_base_url}
+
+    assert s3_bionty_assets("bfxpipelines.json", return_md5=True, **kwargs) == (
+        localpath,
+        hashlib.md5(b"{}").hexdigest(),
+    )
+    # the cached file is up to date and not downloaded
+    assert s3_bionty_assets("bfxpipelines.json", return_md5=True, **kwargs) == (
+        localpath,
+        None,
+    )
+    with pytest.raises(ValueError, match="did not match"):
+        s3_bionty_assets(
+            "bfxpipelines.json",
+            localpath=tmp_path / "other.json",
+            assets_base_url=assets_base_url,
+            md5="0" * 32,
+        )
+
+
+OBO = b"""format-version: 1.2
+
+[Term]
+id: PW:0000001
+name: pathway
+"""
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz", ".zst"])
+def test_url_download_compressed(http_server, tmp_path, suffix):
+    if suffix == ".zst":
+        zstandard = pytest.importorskip("zstandard")
+        compressed = zstandard.ZstdCompressor().compress(OBO)
+    else:
+        compress = {".gz": gzip, ".bz2": bz2, ".xz": lzma}[suffix].compress
+        compressed = compress(OBO)
+    (http_server.root / f"pw.obo{suffix}").write_bytes(compressed)
+    url = f"{http_server.url}/pw.obo{suffix}?download=1"
+    assert compression_suffix(url) == suffix
+
+    # the file is stored compressed and decompressed while it's read
+    localpath = tmp_path / f"ontology_all__pw__1__Pathway{compression_suffix(url)}"
+    url_download(url, localpath)
+    assert localpath.read_bytes() == compressed
+    with open_decompressed(localpath) as f:
+        assert f.read() == OBO
+    assert bt.Ontology(localpath).get_term("PW:0000001").name == "pathway"
+
+
+def test_open_decompressed_uncompressed(tmp_path):
+    path = tmp_path / "ontology_all__pw__1__Pathway"
+    path.write_bytes(OBO)
+    assert compression_suffix(path) == ""
+    with open_decompressed(path) as f:
+        assert f.read() == OBO
+
+
+def test_url_download_not_modified(http_server, large_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        Settings, "http_validators", property(lambda self: tmp_path / ".http.json")
+    )
+    url = f"{http_server.url}/large.obo"
+    localpath = tmp_path / "large.obo"
+    url_download(url, localpath)
+    not_modified = io_stats()["not_modified"]
+
+    # the cached file is revalidated with a single request
+    http_server.requests.clear()
+    assert url_download(url, localpath, return_md5=True) == (localpath, None)
+    assert len(http_server.requests) == 1
+    assert io_stats()["not_modified"] == not_modified + 1
+
+    # files that changed locally or remotely are downloaded again
+    localpath.write_bytes(b"changed")
+    url_download(url, localpath)
+    assert localpath.read_bytes() == large_file
+    (http_server.root / "large.obo").write_bytes(large_file[::-1])
+    url_download(url, localpath)
+    assert localpath.read_bytes() == large_file[::-1]
+    assert io_stats()["not_modified"] == not_modified + 1
+
+    # cached files that don't match the expected md5 sum are downloaded again
+    http_server.requests.clear()
+    url_download(url, localpath, md5=hashlib.md5(large_file[::-1]).hexdigest())
+    assert len(http_server.requests) == 1
+    localpath.write_bytes(large_file)
+    os.utime(localpath, ns=(0, 0))
+    with _io._http_validators.update() as index:
+        index[url] = {**index[url], "file": [index[url]["file"][0], len(large_file), 0]}
+    url_download(url, localpath, md5=hashlib.md5(large_file[::-1]).hexdigest())
+    assert localpath.read_bytes() == large_file[::-1]
+
+
+def test_http_validators_pruned(http_server, tmp_path, monkeypatch):
+    index_path = tmp_path / ".http.json"
+    monkeypatch.setattr(Settings, "http_validators", property(lambda self: index_path))
+    for name in ("a.obo", "b.obo"):
+        (http_server.root / name).write_text(name)
+        url_download(f"{http_server.url}/{name}", tmp_path / name)
+    assert len(json.loads(index_path.read_text())) == 2
+
+    # validators of deleted files are dropped when the index is written again
+    (tmp_path / "a.obo").unlink()
+    (http_server.root / "b.obo").write_text("changed")
+    url_download(f"{http_server.url}/b.obo", tmp_path / "b.obo")
+    assert list(json.loads(index_path.read_text())) == [f"{http_server.url}/b.obo"]
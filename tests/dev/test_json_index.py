@@ -0,0 +1,39 @@
+import json
+
+from bionty_base.dev._json_index import JsonIndex
+
+
+def test_json_index_merges_processes(tmp_path):
+    path = tmp_path / ".index.json"
+    # two processes with their own snapshot of the same file
+    first, second = JsonIndex(lambda: path), JsonIndex(lambda: path)
+    with first.update() as index:
+        index["a"] = 1
+        index["b"] = 1
+    assert second.get("a") == 1
+
+    with first.update() as index:
+        index["c"] = 1
+    with second.update() as index:
+        index["a"] = 2
+        del index["b"]
+    # entries the other process wrote in the meantime are kept
+    assert json.loads(path.read_text()) == {"a": 2, "c": 1}
+    assert second.copy() == {"a": 2, "c": 1}
+
+    # entries are merged into the file as it is when writing, not when loading
+    with first.update(save=False) as index:
+        index["d"] = 1
+    with second.update() as index:
+        index["e"] = 1
+    first.save()
+    assert json.loads(path.read_text()) == {"a": 2, "c": 1, "d": 1, "e": 1}
+
+
+def test_json_index_keep(tmp_path):
+    path = tmp_path / ".index.json"
+    index = JsonIndex(lambda: path, keep=lambda key, _: (tmp_path / key).exists())
+    (tmp_path / "a").touch()
+    with index.update() as entries:
+        entries["a"] = entries["b"] = 1
+    assert json.loads(path.read_text()) == {"a": 1}
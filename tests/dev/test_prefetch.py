@@ -0,0 +1,32 @@
+import bionty_base as bt
+from bionty_base.__main__ import main
+
+
+def test_prefetch(local_celltype):
+    report = bt.dev.prefetch(entity="CellType")
+    assert report.shape[0] == 1
+    row = report.iloc[0]
+    assert row["entity"] == "CellType"
+    assert row["error"] is None
+    assert row["bytes"] > 0
+    assert row["seconds"] >= 0
+
+
+def test_prefetch_no_match(local_celltype):
+    assert bt.dev.prefetch(entity="CellType", organism="mars").shape[0] == 0
+
+
+def test_prefetch_reports_errors(local_celltype, monkeypatch):
+    def _load_df(self, columns=None):
+        raise RuntimeError("no connection")
+
+    monkeypatch.setattr(bt.CellType, "_load_df", _load_df)
+    report = bt.dev.prefetch(entity="CellType")
+    assert report.iloc[0]["error"] == "RuntimeError: no connection"
+    assert report.iloc[0]["bytes"] == 0
+    assert main(["prefetch", "--entity", "CellType"]) == 1
+
+
+def test_prefetch_command(local_celltype, capsys):
+    assert main(["prefetch", "--entity", "CellType", "--max-workers", "2"]) == 0
+    assert "CellType" in capsys.readouterr().out
@@ -31,3 +31,29 @@ def test_ensembl_organism_organism():
 def test_ncbitaxon_organism():
     df = bt.Organism(source="ncbitaxon").df()
     assert df.shape[0] > 10
+
+
+def test_ensembl_organism_build_memory_map(tmp_path, monkeypatch):
+    import bionty_base.entities._organism as organism_module
+    from bionty_base._settings import settings
+
+    def write_species(self, url, localpath, md5=""):
+        pd.DataFrame(
+            {
+                "#name": ["Homo sapiens", "Mus musculus"],
+                "species": ["homo_sapiens", "mus_musculus"],
+                "taxonomy_id": [9606, 10090],
+            }
+        ).to_csv(localpath, sep="\t", index=False)
+
+    monkeypatch.setattr(organism_module, "s3_bionty_assets", lambda **kwargs: None)
+    monkeypatch.setattr(bt.Organism, "_url_download", write_species)
+    dynamicdir, memory_map = settings.dynamicdir, settings.memory_map
+    settings.dynamicdir, settings.memory_map = tmp_path, True
+    try:
+        # the table built from the source file is read like a downloaded one
+        df = bt.Organism(source="ensembl").df()
+    finally:
+        settings.dynamicdir, settings.memory_map = dynamicdir, memory_map
+    assert df.index.tolist() == ["homo sapiens", "mus musculus"]
+    assert isinstance(df["ontology_id"].dtype, pd.ArrowDtype)
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+# generous budget for slow CI machines; an eager import of pandas alone exceeds it
+IMPORT_TIME_BUDGET = 0.5
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_import_time_budget():
+    code = (
+        "import time; t = time.perf_counter(); import bionty_base;"
+        " print(time.perf_counter() - t)"
+    )
+    # take the best of a few runs to reduce noise
+    elapsed = min(float(_run(code)) for _ in range(3))
+    assert elapsed < IMPORT_TIME_BUDGET
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys; import bionty_base;"
+        " print(','.join(m for m in ['pandas', 'yaml', 'pronto', 'filelock',"
+        " 'bionty_base._public_ontology', 'bionty_base._sync_sources']"
+        " if m in sys.modules))"
+    )
+    assert _run(code) == ""
+
+
+def test_lazy_attributes():
+    import bionty_base as bt
+
+    assert bt.Species is bt.Organism
+    assert bt.Entity is bt.PublicOntology
+    assert issubclass(bt.CellType, bt.PublicOntology)
+    assert "Gene" in dir(bt)
+    assert bt.display_currently_used_sources().shape[0] > 0
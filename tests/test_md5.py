@@ -1,8 +1,13 @@
+import hashlib
+import json
+import os
 from pathlib import Path
 from typing import Tuple
 
 import pytest
-from bionty_base.dev._md5 import calculate_md5, verify_md5
+from bionty_base._settings import settings
+from bionty_base.dev import _md5
+from bionty_base.dev._md5 import calculate_md5, calculate_md5_many, verify_md5
 
 CURRENT_DIR = Path(__file__).parent
 
@@ -25,3 +30,52 @@ def test_verify_md5_with_matching_md5(file_fixture):
 def test_verify_md5_with_non_matching_md5(file_fixture):
     file_path, _ = file_fixture
     assert not verify_md5(file_path, "0123456789abcdef0123456789abcdef")
+
+
+@pytest.fixture
+def md5_index(tmp_path):
+    """An empty md5 index in a temporary versionsdir."""
+    versionsdir = settings.versionsdir
+    settings.versionsdir = tmp_path / "versions"
+    yield settings.md5_index
+    settings.versionsdir = versionsdir
+
+
+def _old_file(path: Path, content: bytes, mtime: float = 1e9) -> Path:
+    path.write_bytes(content)
+    os.utime(path, times=(mtime, mtime))
+    return path
+
+
+def test_calculate_md5_is_recorded(md5_index, tmp_path):
+    path = _old_file(tmp_path / "ontology.obo", b"format-version: 1.2")
+    expected_md5 = hashlib.md5(b"format-version: 1.2").hexdigest()
+    assert calculate_md5(path) == expected_md5
+    assert json.loads(md5_index.read_text())[path.resolve().as_posix()][3] == (
+        expected_md5
+    )
+
+    # unchanged files are not read again
+    with _md5._md5_index.update() as index:
+        index[path.resolve().as_posix()][3] = "recorded"
+    assert calculate_md5(path) == "recorded"
+
+    # changed files are hashed again
+    _old_file(path, b"format-version: 1.4", mtime=1e9 + 1)
+    assert calculate_md5(path) == hashlib.md5(b"format-version: 1.4").hexdigest()
+
+
+def test_calculate_md5_recent_file_not_recorded(md5_index, tmp_path):
+    path = tmp_path / "ontology.obo"
+    path.write_bytes(b"format-version: 1.2")
+    calculate_md5(path)
+    assert path.resolve().as_posix() not in _md5._md5_index.copy()
+
+
+def test_calculate_md5_many(md5_index, tmp_path):
+    contents = {tmp_path / f"{i}.obo": os.urandom(i * 1000) for i in range(8)}
+    paths = [_old_file(path, content) for path, content in contents.items()]
+    assert calculate_md5_many(paths, max_workers=4) == {
+        path: hashlib.md5(content).hexdigest() for path, content in contents.items()
+    }
+    assert len(json.loads(md5_index.read_text())) == 8
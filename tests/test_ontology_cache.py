@@ -0,0 +1,79 @@
+import bionty_base as bt
+import pandas as pd
+import pytest
+from bionty_base._ontology_cache import OntologyCache
+
+
+def _df(n_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"ontology_id": range(n_rows), "name": ["x"] * n_rows})
+
+
+# fits two but not three of the tables of 50 rows
+CACHE_BUDGET = int(_df(50).memory_usage(index=True, deep=True).sum() * 2.5)
+
+
+@pytest.fixture
+def cache_budget():
+    bt.settings.ontology_cache_max_bytes = CACHE_BUDGET
+    yield
+    bt.settings.ontology_cache_max_bytes = 0
+    bt.dev.clear_ontology_cache()
+
+
+def test_cache_disabled_by_default():
+    cache = OntologyCache()
+    cache.put(("a",), _df(10))
+    assert cache.get(("a",)) is None
+    assert cache.stats()["misses"] == 0
+
+
+def test_lru_eviction(cache_budget):
+    cache = OntologyCache()
+    df_a, df_b, df_c = _df(50), _df(50), _df(50)
+    cache.put(("a",), df_a)
+    cache.put(("b",), df_b)
+    assert cache.get(("a",)) is df_a
+    # exceeding the budget evicts the least recently used table
+    cache.put(("c",), df_c)
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is df_a
+    assert cache.get(("c",)) is df_c
+    stats = cache.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert 0 < stats["nbytes"] <= CACHE_BUDGET
+    # tables larger than the budget are not cached
+    cache.put(("d",), _df(1000))
+    assert cache.get(("d",)) is None
+
+
+def test_public_ontology_shares_cached_table(cache_budget, monkeypatch):
+    n_loads = []
+
+    def _load_df(self, columns=None):
+        n_loads.append(1)
+        return _df(10).set_index("ontology_id")
+
+    monkeypatch.setattr(bt.CellType, "_load_df", _load_df)
+    ct_1 = bt.CellType()
+    ct_2 = bt.CellType()
+    assert len(n_loads) == 1
+    assert ct_1._df is ct_2._df
+    assert bt.dev.ontology_cache_stats()["hits"] == 1
+    bt.CellType(version=ct_1.version, organism="all", source="cl")
+    assert len(n_loads) == 1
+
+
+def test_df_of_cached_table_is_not_shared(cache_budget, monkeypatch):
+    # tables without ontology_id, e.g. of genes
+    monkeypatch.setattr(
+        bt.CellType,
+        "_load_df",
+        lambda self, columns=None: _df(10).drop(columns="ontology_id"),
+    )
+    df = bt.CellType().df()
+    df["name"] = "y"
+    df.drop(index=0, inplace=True)
+    assert bt.CellType().df()["name"].tolist() == ["x"] * 10
@@ -0,0 +1,152 @@
+import bionty_base as bt
+import pandas as pd
+import pytest
+
+
+def test_load_all_columns(local_celltype):
+    ct = bt.CellType()
+    assert list(ct._df.columns) == list(local_celltype.columns)
+    assert ct.fields == set(local_celltype.columns)
+    assert ct.validate(["T cell", "X cell"], field=ct.name, mute=True).tolist() == [
+        True,
+        False,
+    ]
+
+
+def test_load_cached_without_lock(local_celltype, monkeypatch):
+    import bionty_base._public_ontology as public_ontology
+
+    def file_lock(path):
+        raise AssertionError(f"{path} was locked")
+
+    # trusted cached tables are read without creating a lock file
+    monkeypatch.setattr(public_ontology, "file_lock", file_lock)
+    assert len(bt.CellType().df()) == len(local_celltype)
+
+
+def test_column_projection(local_celltype):
+    ct = bt.CellType(columns=["name"])
+    assert list(ct._df.columns) == ["ontology_id", "name"]
+    # fields of columns that are not loaded are still available
+    assert ct.fields == set(local_celltype.columns)
+
+    assert ct.validate(["B cell"], field=ct.name, mute=True).all()
+    assert list(ct._df.columns) == ["ontology_id", "name"]
+
+    assert ct.standardize(["T lymphocyte"], field=ct.name) == ["T cell"]
+    assert list(ct._df.columns) == ["ontology_id", "name", "synonyms"]
+
+    # remaining columns are loaded on first access of the full table
+    pd.testing.assert_frame_equal(ct.df(), bt.CellType().df())
+
+    with pytest.raises(ValueError):
+        bt.CellType(columns=["symbol"])
+
+
+def test_memory_map(local_celltype):
+    from bionty_base._settings import settings
+
+    settings.memory_map = True
+    try:
+        ct = bt.CellType(columns=["name"])
+        assert (
+            (settings.dynamicdir / ct._parquet_filename).with_suffix(".arrow").exists()
+        )
+        assert isinstance(ct._df["name"].dtype, pd.ArrowDtype)
+        assert ct.validate(["T cell", "X cell"], field=ct.name, mute=True).tolist() == [
+            True,
+            False,
+        ]
+        assert ct.inspect(["mast cell"], field=ct.name, mute=True).validated == [
+            "mast cell"
+        ]
+        assert ct.df().shape == (3, 4)
+        assert ct.lookup().mast_cell.ontology_id == "CL:0000003"
+    finally:
+        settings.memory_map = False
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_diff_local(local_celltype, local_celltype_previous, memory_map):
+    from bionty_base._settings import settings
+
+    settings.memory_map = memory_map
+    try:
+        ct = bt.CellType()
+        new_entries, modified_entries = ct.diff(
+            bt.CellType(version=local_celltype_previous)
+        )
+    finally:
+        settings.memory_map = False
+    # entries that differ count as new in both versions
+    assert sorted(new_entries.index) == ["CL:0000002", "CL:0000002", "CL:0000003"]
+    assert new_entries.loc["CL:0000003", "parents"] == ()
+    assert modified_entries.index.tolist() == ["CL:0000002"]
+
+
+def test_diff_without_arrow_dtype(local_celltype, local_celltype_previous, monkeypatch):
+    # pandas<2 has no ArrowDtype, tables with default dtypes are still compared
+    monkeypatch.delattr(pd, "ArrowDtype")
+    _, modified_entries = bt.CellType().diff(
+        bt.CellType(version=local_celltype_previous)
+    )
+    assert modified_entries.index.tolist() == ["CL:0000002"]
+
+
+def test_lazy(local_celltype, monkeypatch):
+    n_loads = []
+    load_df = bt.CellType._load_df
+
+    def _load_df(self, columns=None):
+        n_loads.append(columns)
+        return load_df(self, columns=columns)
+
+    monkeypatch.setattr(bt.CellType, "_load_df", _load_df)
+
+    # fields are read from the schema of the cached table
+    ct = bt.CellType(lazy=True)
+    assert ct.source == "cl"
+    assert ct.fields == set(local_celltype.columns)
+    assert str(ct.name) == "name"
+    assert "#terms: \n" in repr(ct)
+    assert len(n_loads) == 0
+    assert ct.validate(["T cell"], field=ct.name, mute=True).all()
+    assert len(n_loads) == 1
+    assert "#terms: 3" in repr(ct)
+
+    # without a cached table, fields are known once the table is loaded
+    (bt.settings.dynamicdir / ct._parquet_filename).unlink()
+    monkeypatch.setattr(
+        bt.CellType,
+        "_load_df",
+        lambda self, columns=None: local_celltype.set_index("ontology_id"),
+    )
+    ct = bt.CellType(lazy=True)
+    assert ct._loaded_df is None
+    assert str(ct.definition) == "definition"
+    assert ct._loaded_df is not None
+    with pytest.raises(AttributeError):
+        ct.symbol  # noqa: B018
+
+
+def test_url_download_mirror_mismatch(local_celltype, monkeypatch):
+    import bionty_base._public_ontology as public_ontology
+
+    def s3_bionty_assets(filename, localpath, **kwargs):
+        raise ValueError(f"MD5 sum for {localpath} did not match 0.")
+
+    def url_download(url, localpath, md5="", return_md5=False):
+        localpath.write_text("format-version: 1.2\n")
+        downloads.append(url)
+        return localpath, md5
+
+    ct = bt.CellType()
+    downloads: list = []
+    monkeypatch.setattr(public_ontology, "s3_bionty_assets", s3_bionty_assets)
+    monkeypatch.setattr(public_ontology, "url_download", url_download)
+
+    # a mirrored file that doesn't match md5 is downloaded from the url instead
+    localpath = bt.settings.dynamicdir / "cl.obo"
+    assert ct._url_download(ct._url, localpath, md5="0") == "0"
+    assert downloads == [ct._url]
+    assert localpath.exists()
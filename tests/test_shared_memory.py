@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import bionty_base as bt
+import pytest
+
+
+def test_share_and_attach_ontology(local_celltype, local_celltype_previous):
+    celltype = bt.CellType()
+    name = bt.dev.share_ontology(celltype)
+    try:
+        attached = bt.dev.attach_ontology(name)
+        assert isinstance(attached, bt.CellType)
+        assert attached.source == celltype.source
+        assert attached.version == celltype.version
+        assert attached.fields == celltype.fields
+        assert attached.df().index.tolist() == celltype.df().index.tolist()
+        assert attached.df()["name"].tolist() == celltype.df()["name"].tolist()
+
+        assert attached.validate(
+            ["T cell", "X cell"], field=attached.name
+        ).tolist() == [
+            True,
+            False,
+        ]
+        assert attached.standardize(["T-cell"]) == ["T cell"]
+        assert attached.inspect(["B cell"], field=attached.name)["validated"] == [
+            "B cell"
+        ]
+        assert attached.lookup().mast_cell.ontology_id == "CL:0000003"
+        # attached tables are Arrow-backed
+        _, modified_entries = attached.diff(
+            bt.CellType(version=local_celltype_previous)
+        )
+        assert modified_entries.index.tolist() == ["CL:0000002"]
+    finally:
+        bt.dev.unshare_ontology(name)
+
+
+def test_attach_ontology_from_other_process(local_celltype):
+    name = bt.dev.share_ontology(bt.CellType())
+    try:
+        script = (
+            "import bionty_base as bt;"
+            f"celltype = bt.dev.attach_ontology({name!r});"
+            "print(celltype.validate(['mast cell'], field='name').tolist())"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, check=True, text=True
+        ).stdout
+        assert output.strip() == "[True]"
+        # the block outlives the attaching process
+        assert bt.dev.attach_ontology(name).df().shape[0] == 3
+    finally:
+        bt.dev.unshare_ontology(name)
+
+    with pytest.raises(FileNotFoundError):
+        bt.dev.attach_ontology(name)
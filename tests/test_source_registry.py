@@ -0,0 +1,64 @@
+import bionty_base as bt
+import pytest
+from bionty_base._source_registry import SourceRegistry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    available = [
+        {"entity": "Disease", "organism": "all", "source": "mondo", "version": "2"},
+        {"entity": "Disease", "organism": "all", "source": "mondo", "version": "1"},
+        {"entity": "Disease", "organism": "human", "source": "doid", "version": "3"},
+        {"entity": "Gene", "organism": "human", "source": "ensembl", "version": "r2"},
+        {"entity": "Gene", "organism": "mouse", "source": "ensembl", "version": "r2"},
+    ]
+    current = [available[0], available[2], available[3], available[4]]
+    yield SourceRegistry(available_records=available, current_records=current)
+
+
+def test_match(registry):
+    assert registry.match("Disease")["version"] == "2"
+    assert registry.match("Disease", version="1")["source"] == "mondo"
+    assert registry.match("Disease", organism="human")["source"] == "doid"
+    assert registry.match("Gene", organism="mouse", source="ensembl") == {
+        "entity": "Gene",
+        "organism": "mouse",
+        "source": "ensembl",
+        "version": "r2",
+    }
+    assert (
+        registry.match("Disease", "all", "mondo", "1", currently_used=False)["version"]
+        == "1"
+    )
+    with pytest.raises(ValueError):
+        registry.match("Disease", version="1", currently_used=True)
+    with pytest.raises(ValueError):
+        registry.match("Tissue")
+
+
+def test_views(registry):
+    assert len(registry.available("Disease")) == 3
+    assert len(registry.current("Gene")) == 2
+    assert registry.available_df().shape == (5, 7)
+    assert list(registry.current_df().columns) == ["organism", "source", "version"]
+
+
+def test_process_wide_registry():
+    registry = SourceRegistry.get()
+    assert SourceRegistry.get() is registry
+    assert bt.display_available_sources().shape == registry.available_df().shape
+    current = bt.display_currently_used_sources()
+    assert current.loc["CellType"].source == "cl"
+
+
+def test_select():
+    registry = bt.SourceRegistry.get()
+    records = registry.select(entity=["CellType", "Disease"])
+    assert {record["entity"] for record in records} == {"CellType", "Disease"}
+    assert len(records) == len(registry.current("CellType")) + len(
+        registry.current("Disease")
+    )
+    assert registry.select(entity="Gene", organism="mars") == []
+    assert len(registry.select(entity="Gene", currently_used=False)) == len(
+        registry.available("Gene")
+    )
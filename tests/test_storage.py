@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import bionty_base as bt
+import pandas as pd
+import pyarrow as pa
+import pytest
+from bionty_base._settings import settings
+from bionty_base._storage import (
+    read_memory_mapped_columns,
+    to_pandas,
+    write_parquet,
+)
+
+
+@pytest.fixture
+def table():
+    yield pa.table(
+        {
+            "symbol": [f"GENE{i}" for i in range(100)],
+            "biotype": ["protein_coding"] * 90 + ["lncRNA"] * 10,
+        }
+    )
+
+
+def test_to_pandas_compact_dtypes(table):
+    df = to_pandas(table, compact_dtypes="category")
+    assert df["biotype"].dtype == "category"
+    assert df["symbol"].dtype != "category"
+
+    df = to_pandas(table, compact_dtypes="dictionary")
+    assert pa.types.is_dictionary(df["biotype"].dtype.pyarrow_dtype)
+    assert pa.types.is_string(df["symbol"].dtype.pyarrow_dtype)
+
+    df = to_pandas(table, compact_dtypes="arrow")
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+
+    with pytest.raises(ValueError):
+        to_pandas(table, compact_dtypes="float16")
+
+
+def test_read_memory_mapped_columns_threads(table, tmp_path):
+    parquet_path = tmp_path / "df_genes.parquet"
+    write_parquet(table.to_pandas(), parquet_path)
+    # all threads convert the parquet file at the same time
+    with ThreadPoolExecutor(8) as executor:
+        dfs = list(
+            executor.map(lambda _: read_memory_mapped_columns(parquet_path), range(32))
+        )
+    assert all(df["symbol"].tolist() == table["symbol"].to_pylist() for df in dfs)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "df_genes.arrow",
+        "df_genes.parquet",
+    ]
+
+
+@pytest.mark.parametrize("compact_dtypes", ["category", "arrow", "dictionary"])
+def test_compact_dtypes_ontology(
+    local_celltype, local_celltype_previous, compact_dtypes
+):
+    settings.compact_dtypes = compact_dtypes
+    try:
+        ct = bt.CellType()
+        assert ct.validate(["T cell", "X cell"], field=ct.name, mute=True).tolist() == [
+            True,
+            False,
+        ]
+        assert ct.standardize(["T lymphocyte"], field=ct.name) == ["T cell"]
+        new_entries, modified_entries = ct.diff(
+            bt.CellType(version=local_celltype_previous)
+        )
+        # entries that differ count as new in both versions
+        assert sorted(new_entries.index) == ["CL:0000002", "CL:0000002", "CL:0000003"]
+        assert modified_entries.index.tolist() == ["CL:0000002"]
+    finally:
+        settings.compact_dtypes = None
+
+    report = bt.dev.memory_report([ct], compact_dtypes=compact_dtypes)
+    assert report.loc["CellType", "bytes_default"] > 0
+    assert report.loc["CellType", "bytes_compact"] > 0
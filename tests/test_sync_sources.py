@@ -0,0 +1,52 @@
+from bionty_base import _sync_sources
+from bionty_base._settings import settings
+from bionty_base._sync_sources import sync_sources
+from bionty_base.dev._io import load_yaml, write_yaml
+
+
+def test_sync_sources_skips_when_unchanged(monkeypatch):
+    sync_sources()
+    mtime = settings.current_sources.stat().st_mtime_ns
+
+    def _raise(*args, **kwargs):
+        raise AssertionError("lock should not be taken")
+
+    monkeypatch.setattr(_sync_sources, "FileLock", _raise)
+    sync_sources()
+    assert settings.current_sources.stat().st_mtime_ns == mtime
+
+
+def test_sync_sources_rewrites_when_changed():
+    sync_sources()
+    current_version = load_yaml(settings.current_sources)["Disease"]["all"]["mondo"]
+    local = load_yaml(settings.local_sources)
+    mondo_versions = local["Disease"]["mondo"]["all"]
+    mondo_versions.pop(next(k for k in mondo_versions if str(k) == current_version))
+    write_yaml(local, settings.local_sources)
+    try:
+        sync_sources()
+        current = load_yaml(settings.current_sources)
+        assert current["Disease"]["all"]["mondo"] != current_version
+    finally:
+        settings.local_sources.unlink()
+        sync_sources()
+    current = load_yaml(settings.current_sources)
+    assert current["Disease"]["all"]["mondo"] == current_version
+
+
+def test_sources_synced_on_first_use(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    # a fresh install, sources are synced when the sources files are first used
+    code = (
+        "import bionty_base as bt; path = bt.settings.versionsdir;"
+        " assert not (path / '.current_sources.yaml').exists();"
+        " assert bt.settings.current_sources.exists()"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "LAMIN_SETTINGS_DIR": str(tmp_path)},
+        check=True,
+    )